@@ -0,0 +1,143 @@
+"""Concurrency benchmark for the feature tracking server.
+
+Heavy clients repeatedly call feature_get_parallelizable and page through
+a category 1000 rows at a time, while polling clients call
+feature_get_stats. All calls go through FastMCP's call_tool on one event
+loop, as concurrent requests to a single server would, and the
+feature_get_stats latencies are reported.
+
+--inline runs tool bodies on the event loop instead of the database
+worker pool, which is how the server behaved before db_tool.
+
+Usage:
+    python benchmarks/concurrency.py --heavy 2
+    python benchmarks/concurrency.py --heavy 6 --inline
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# server.py and database.py are imported as top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert  # noqa: E402
+
+import database  # noqa: E402
+import server  # noqa: E402
+
+CATEGORIES = "ABCDEFGHIJKLMNOPQRST"
+
+
+def seed(project_dir: Path, count: int) -> None:
+    """Create a database with count features, a third of them passing."""
+    engine, session_maker = database.create_database(project_dir)
+    rows = [
+        {
+            "priority": i + 1,
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "name": f"Feature {i + 1}",
+            "description": "Benchmark feature " * 8,
+            "steps": [f"Step {n}" for n in range(5)],
+            "passes": i % 3 == 0,
+        }
+        for i in range(count)
+    ]
+    with session_maker() as session:
+        session.execute(insert(database.Feature), rows)
+        session.commit()
+    engine.dispose()
+
+
+async def heavy_client(stop: asyncio.Event, category: str, calls: list) -> None:
+    """Alternate feature_get_parallelizable with a full category listing.
+
+    Each call yields to the loop first, as a new request would; inline
+    tool bodies never suspend, so the loop would otherwise never run.
+    """
+    while not stop.is_set():
+        await asyncio.sleep(0)
+        await server.mcp.call_tool("feature_get_parallelizable", {"limit": 10, "mode": "max_parallel"})
+        after = None
+        while True:
+            await asyncio.sleep(0)
+            page = await server.mcp.call_tool(
+                "feature_get_by_category", {"category": category, "limit": 1000, "after": after}
+            )
+            after = server.json.loads(page[0].text).get("next_cursor")
+            if after is None or stop.is_set():
+                break
+        calls.append(1)
+
+
+async def stats_client(stop: asyncio.Event, interval: float, latencies: list) -> None:
+    """Poll feature_get_stats, recording each call's latency in ms.
+
+    Latency runs from when the poll was due, so time spent waiting for a
+    blocked event loop counts, as it would for a client.
+    """
+    due = time.perf_counter()
+    while not stop.is_set():
+        await server.mcp.call_tool("feature_get_stats", {})
+        done = time.perf_counter()
+        latencies.append((done - due) * 1000)
+        due = done + interval
+        await asyncio.sleep(interval)
+
+
+async def run(args) -> None:
+    server.PROJECT_DIR = args.project_dir
+    async with server.server_lifespan(server.mcp):
+        executor = server._db_executor
+        if args.inline:
+            server._db_executor = None
+        try:
+            stop = asyncio.Event()
+            latencies, calls = [], []
+            tasks = [
+                asyncio.create_task(heavy_client(stop, CATEGORIES[n % len(CATEGORIES)], calls))
+                for n in range(args.heavy)
+            ] + [
+                asyncio.create_task(stats_client(stop, args.interval, latencies))
+                for _ in range(args.pollers)
+            ]
+            # Inline tool bodies block the loop, so stop from a thread
+            timer = asyncio.get_running_loop().run_in_executor(None, time.sleep, args.seconds)
+            await timer
+            stop.set()
+            await asyncio.gather(*tasks)
+        finally:
+            server._db_executor = executor
+
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    mode = "inline" if args.inline else f"{server.DB_WORKERS} workers"
+    print(
+        f"{args.heavy} heavy / {args.pollers} polling clients, {mode}, {args.seconds:g} s: "
+        f"{len(calls)} heavy rounds; feature_get_stats {len(latencies)} calls, "
+        f"p50 {quantiles[49]:.1f} ms, p95 {quantiles[94]:.1f} ms, max {max(latencies):.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent clients against one server")
+    parser.add_argument("--features", type=int, default=20000, help="Features in the database (default 20000)")
+    parser.add_argument("--heavy", type=int, default=2, help="Heavy clients (default 2)")
+    parser.add_argument("--pollers", type=int, default=4, help="feature_get_stats clients (default 4)")
+    parser.add_argument("--interval", type=float, default=0.05, help="Seconds between stats polls (default 0.05)")
+    parser.add_argument("--seconds", type=float, default=10, help="Run time (default 10)")
+    parser.add_argument("--inline", action="store_true", help="Run tool bodies on the event loop (pre-db_tool behavior)")
+    parser.add_argument("--project-dir", type=Path, help="Existing database directory (default: a seeded temporary one)")
+    args = parser.parse_args()
+
+    if args.project_dir is None:
+        args.project_dir = Path(tempfile.mkdtemp(prefix="features-bench-"))
+        seed(args.project_dir, args.features)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,15 +11,32 @@ Database Location:
 Version History:
 - v1.0: Initial schema with Feature table
 - v1.1: Added ParallelGroup table for dispatch coordination
+- v1.2: Added trigger-maintained FeatureStats counters, queue/category/group indexes
+- v1.3: Added RegressionRun history and Feature.last_regression_at
+- v1.4: Added Feature.version for optimistic concurrency control
+- v1.5: Added Feature.lease_expires_at for expiring in-progress claims
+- v1.6: Added FeatureDependency edges and the Feature.blocked_by ready-queue counter
+- v1.7: Added trigger-written FeatureEvent change feed
+- v1.8: Added ImportCheckpoint for resumable JSON imports
+
+The schema version is stored in PRAGMA user_version: v1.N is migration N in
+MIGRATIONS, and a database already at SCHEMA_VERSION opens without schema
+introspection. Run this module to apply (or, with --dry-run, list) pending
+migrations without starting the server.
 """
 
-from datetime import datetime
+import os
+import sys
+import threading
+import time
+import weakref
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text, create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import Session, relationship, sessionmaker
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String, Text, create_engine, event, text
+from sqlalchemy.orm import Session, declarative_base, relationship, sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
 from sqlalchemy.types import JSON
 
 Base = declarative_base()
@@ -59,6 +76,76 @@ CATEGORY_PARALLELIZATION_MATRIX = {
 CRITICAL_CATEGORIES = {"A", "P"}
 
 
+def _compile_category_masks(matrix: dict, critical: set) -> tuple:
+    """Compile the parallelization matrix into per-category bitmasks.
+
+    Each category gets one bit; its mask has the bits of every category it
+    can run alongside. Critical categories get an empty mask and are
+    excluded from every other mask.
+
+    Raises:
+        ValueError: If the matrix is not symmetric.
+
+    Returns:
+        Tuple of (bits, masks), both dicts keyed by category code.
+    """
+    asymmetric = sorted(
+        f"{cat}-{other}"
+        for cat, safe in matrix.items()
+        for other in safe
+        if cat not in matrix.get(other, set())
+    )
+    if asymmetric:
+        raise ValueError(f"CATEGORY_PARALLELIZATION_MATRIX is not symmetric: {', '.join(asymmetric)}")
+
+    bits = {cat: 1 << i for i, cat in enumerate(sorted(matrix))}
+    masks = {}
+    for cat, safe in matrix.items():
+        mask = 0
+        if cat not in critical:
+            for other in safe:
+                if other != cat and other not in critical:
+                    mask |= bits[other]
+        masks[cat] = mask
+    return bits, masks
+
+
+# Compiled once at import; unknown categories have no bit and an empty mask,
+# so they never parallelize
+CATEGORY_BITS, CATEGORY_MASKS = _compile_category_masks(
+    CATEGORY_PARALLELIZATION_MATRIX, CRITICAL_CATEGORIES
+)
+
+
+# In-progress lease length; matches the registry's default lockTimeoutSeconds
+DEFAULT_LEASE_SECONDS = 3600
+
+
+# SQLite PRAGMA profiles applied to every new connection
+# Select with FEATURES_DB_PROFILE=durable|fast (default: durable)
+# Both use WAL so readers never block the writer; "fast" trades the last
+# few commits on power loss (synchronous=NORMAL) for fewer fsyncs.
+DEFAULT_PRAGMA_PROFILE = "durable"
+PRAGMA_PROFILES = {
+    "durable": {
+        "busy_timeout": 10000,  # ms to wait on a locked database before failing
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16000,  # negative = KiB
+        "temp_store": "MEMORY",
+        "mmap_size": 0,
+    },
+    "fast": {
+        "busy_timeout": 10000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+        "mmap_size": 268435456,  # 256 MiB
+    },
+}
+
+
 class Feature(Base):
     """Feature model representing a testable feature to implement.
 
@@ -71,6 +158,12 @@ class Feature(Base):
         steps: JSON array of test/implementation steps
         passes: True when feature is implemented and verified
         in_progress: True when an agent is actively working on this feature
+        version: Row version, bumped by every UPDATE; a write made against a
+            stale version raises StaleDataError instead of overwriting
+        lease_expires_at: When an in-progress claim lapses; an expired
+            feature is claimable again and is released by the lease sweeper
+        blocked_by: Number of dependencies not yet passing, kept current by
+            DEPENDENCY_TRIGGERS; only features at 0 are ready to claim
 
     Categories (A-T):
         A: Security & Authentication
@@ -107,15 +200,82 @@ class Feature(Base):
     in_progress = Column(Boolean, default=False, index=True)
 
     # Dispatch tracking fields (added in v1.1)
-    parallel_group_id = Column(Integer, ForeignKey("parallel_groups.id"), nullable=True)
+    parallel_group_id = Column(Integer, ForeignKey("parallel_groups.id"), nullable=True, index=True)
     dispatched_by = Column(String(100), nullable=True)  # Session ID that dispatched this
     dispatched_at = Column(DateTime, nullable=True)
 
+    # Regression tracking (added in v1.3)
+    last_regression_at = Column(DateTime, nullable=True)  # Last regression check, any result
+
+    # Optimistic concurrency (added in v1.4)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # In-progress lease (added in v1.5)
+    lease_expires_at = Column(DateTime, nullable=True)
+
+    # Unmet dependency count (added in v1.6)
+    blocked_by = Column(Integer, nullable=False, default=0, server_default="0")
+
     # Relationship to parallel group
     parallel_group = relationship("ParallelGroup", back_populates="features")
 
-    def to_dict(self) -> dict:
-        """Convert feature to dictionary for JSON serialization."""
+    __table_args__ = (
+        # Ready-queue index: serves "passes = 0 AND blocked_by = 0
+        # [AND in_progress = 0] ORDER BY priority, id" without a temp B-tree
+        # sort or visiting blocked features. The leading passes column makes
+        # the planner prefer it over ix_features_passes; partial, so passing
+        # features (the bulk of a mature project) are not indexed.
+        Index(
+            "ix_features_ready_queue",
+            "passes",
+            "blocked_by",
+            "priority",
+            "id",
+            "in_progress",
+            sqlite_where=passes == False,
+        ),
+        # Category listing: keyset pagination on (priority, id) and covering
+        # passing/pending counts per category
+        Index("ix_features_category", "category", "priority", "id", "passes"),
+        # Regression queue: passing features, least recently verified
+        # first (never-verified NULLs sort first)
+        Index(
+            "ix_features_regression_queue",
+            "passes",
+            "last_regression_at",
+            "id",
+            sqlite_where=passes == True,
+        ),
+    )
+
+    # ORM flushes emit UPDATE ... WHERE id = ? AND version = ? and bump the
+    # version. Core UPDATE statements must bump it themselves.
+    __mapper_args__ = {"version_id_col": version}
+
+    def lease_expired(self, now: datetime) -> bool:
+        """True if the feature is in progress but its lease has lapsed."""
+        return bool(self.in_progress) and self.lease_expires_at is not None and self.lease_expires_at < now
+
+    def to_dict(self, verbosity: str = "full") -> dict:
+        """Convert feature to dictionary for JSON serialization.
+
+        Args:
+            verbosity: "ids" (id only), "summary" (no description, steps or
+                dispatch fields) or "full" (default)
+        """
+        if verbosity == "ids":
+            return {"id": self.id}
+        if verbosity == "summary":
+            return {
+                "id": self.id,
+                "priority": self.priority,
+                "category": self.category,
+                "name": self.name,
+                "passes": self.passes,
+                "in_progress": self.in_progress,
+                "blocked_by": self.blocked_by,
+                "version": self.version,
+            }
         return {
             "id": self.id,
             "priority": self.priority,
@@ -128,6 +288,63 @@ class Feature(Base):
             "parallel_group_id": self.parallel_group_id,
             "dispatched_by": self.dispatched_by,
             "dispatched_at": self.dispatched_at.isoformat() if self.dispatched_at else None,
+            "last_regression_at": self.last_regression_at.isoformat() if self.last_regression_at else None,
+            "lease_expires_at": self.lease_expires_at.isoformat() if self.lease_expires_at else None,
+            "blocked_by": self.blocked_by,
+            "version": self.version,
+        }
+
+
+class FeatureDependency(Base):
+    """Dependency edge: feature_id cannot start until depends_on_id passes.
+
+    Attributes:
+        feature_id: The dependent feature
+        depends_on_id: The feature it waits for
+    """
+
+    __tablename__ = "feature_dependencies"
+
+    feature_id = Column(Integer, ForeignKey("features.id"), primary_key=True)
+    depends_on_id = Column(Integer, ForeignKey("features.id"), primary_key=True, index=True)
+
+    def to_dict(self) -> dict:
+        """Convert dependency to dictionary for JSON serialization."""
+        return {"feature_id": self.feature_id, "depends_on_id": self.depends_on_id}
+
+
+class FeatureEvent(Base):
+    """Change feed entry, appended by FEATURE_EVENT_TRIGGERS.
+
+    Attributes:
+        seq: Sequence number; AUTOINCREMENT, so never reused after pruning
+        feature_id: Feature that changed (None for group events)
+        group_id: Parallel group involved, if any
+        event: created, claimed, released, skipped, passing, reopened,
+            ready, group_created, group_completed or group_aborted
+        session_id: dispatched_by / parent_session at the time of the event
+        created_at: When the event was written (UTC)
+    """
+
+    __tablename__ = "feature_events"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq = Column(Integer, primary_key=True)
+    feature_id = Column(Integer, nullable=True)
+    group_id = Column(Integer, nullable=True)
+    event = Column(String(20), nullable=False)
+    session_id = Column(String(100), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self) -> dict:
+        """Convert event to dictionary for JSON serialization."""
+        return {
+            "seq": self.seq,
+            "feature_id": self.feature_id,
+            "group_id": self.group_id,
+            "event": self.event,
+            "session_id": self.session_id,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
         }
 
 
@@ -166,6 +383,284 @@ class ParallelGroup(Base):
         }
 
 
+class RegressionRun(Base):
+    """RegressionRun model recording one regression check of a feature.
+
+    Attributes:
+        id: Primary key, auto-incrementing
+        feature_id: Feature that was checked
+        session_id: Session that ran the check
+        result: Outcome (passed, failed)
+        run_at: When the check was recorded
+        duration_seconds: How long the check took, if reported
+    """
+
+    __tablename__ = "regression_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    feature_id = Column(Integer, ForeignKey("features.id"), nullable=False)
+    session_id = Column(String(100), nullable=True)
+    result = Column(String(20), nullable=False)  # passed, failed
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    duration_seconds = Column(Float, nullable=True)
+
+    __table_args__ = (
+        Index("ix_regression_runs_feature_run_at", "feature_id", "run_at"),
+    )
+
+    def to_dict(self) -> dict:
+        """Convert regression run to dictionary for JSON serialization."""
+        return {
+            "id": self.id,
+            "feature_id": self.feature_id,
+            "session_id": self.session_id,
+            "result": self.result,
+            "run_at": self.run_at.isoformat() if self.run_at else None,
+            "duration_seconds": self.duration_seconds,
+        }
+
+
+class FeatureStats(Base):
+    """Single-row counter table kept in sync with features by triggers.
+
+    Lets feature_get_stats read progress in O(1) instead of scanning the
+    features table. The triggers run inside the writing transaction, so the
+    counters are correct for every writer, including other processes.
+
+    Attributes:
+        id: Always 1
+        total: Number of features
+        passing: Number of features with passes=true
+        in_progress: Number of features with in_progress=true
+        next_priority: Next free tail priority (see reserve_priorities)
+    """
+
+    __tablename__ = "feature_stats"
+
+    id = Column(Integer, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    passing = Column(Integer, nullable=False, default=0)
+    in_progress = Column(Integer, nullable=False, default=0)
+    next_priority = Column(Integer, nullable=False, default=1)
+
+
+class ImportCheckpoint(Base):
+    """Progress of an interrupted JSON import (see migration.py).
+
+    Updated in the same transaction as each imported chunk, so after a
+    crash it always matches the rows actually committed. Deleted when the
+    import completes.
+
+    Attributes:
+        source: File name being imported (e.g. feature_list.json)
+        source_size: File size in bytes when the import started
+        source_mtime: File modification time when the import started
+        imported: Number of array elements already committed
+        updated_at: When the last chunk was committed
+    """
+
+    __tablename__ = "import_checkpoints"
+
+    source = Column(String(255), primary_key=True)
+    source_size = Column(Integer, nullable=False)
+    source_mtime = Column(Float, nullable=False)
+    imported = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+# Triggers maintaining the feature_stats row (installed by _create_schema or migration 2)
+FEATURE_STATS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_features_stats_insert AFTER INSERT ON features
+    BEGIN
+        UPDATE feature_stats SET
+            total = total + 1,
+            passing = passing + COALESCE(NEW.passes, 0),
+            in_progress = in_progress + COALESCE(NEW.in_progress, 0)
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_features_stats_delete AFTER DELETE ON features
+    BEGIN
+        UPDATE feature_stats SET
+            total = total - 1,
+            passing = passing - COALESCE(OLD.passes, 0),
+            in_progress = in_progress - COALESCE(OLD.in_progress, 0)
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_features_stats_update AFTER UPDATE OF passes, in_progress ON features
+    BEGIN
+        UPDATE feature_stats SET
+            passing = passing + COALESCE(NEW.passes, 0) - COALESCE(OLD.passes, 0),
+            in_progress = in_progress + COALESCE(NEW.in_progress, 0) - COALESCE(OLD.in_progress, 0)
+        WHERE id = 1;
+    END
+    """,
+    # Keep next_priority ahead of explicitly written priorities
+    # (JSON migration, manual edits) so reserved priorities stay unique
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_features_priority_insert AFTER INSERT ON features
+    BEGIN
+        UPDATE feature_stats SET next_priority = MAX(next_priority, NEW.priority + 1)
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_features_priority_update AFTER UPDATE OF priority ON features
+    BEGIN
+        UPDATE feature_stats SET next_priority = MAX(next_priority, NEW.priority + 1)
+        WHERE id = 1;
+    END
+    """,
+]
+
+# Maintain Feature.blocked_by (unmet dependency count) incrementally: adding
+# or removing an edge adjusts its dependent, and a change of passes adjusts
+# every dependent of that feature. passes is stored as 0/1.
+DEPENDENCY_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_dependencies_insert AFTER INSERT ON feature_dependencies
+    BEGIN
+        UPDATE features SET blocked_by = blocked_by + 1
+        WHERE id = NEW.feature_id
+            AND (SELECT COALESCE(passes, 0) FROM features WHERE id = NEW.depends_on_id) = 0;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_dependencies_delete AFTER DELETE ON feature_dependencies
+    BEGIN
+        UPDATE features SET blocked_by = blocked_by - 1
+        WHERE id = OLD.feature_id
+            AND (SELECT COALESCE(passes, 0) FROM features WHERE id = OLD.depends_on_id) = 0;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_features_dependents_update AFTER UPDATE OF passes ON features
+    WHEN COALESCE(NEW.passes, 0) != COALESCE(OLD.passes, 0)
+    BEGIN
+        UPDATE features SET blocked_by = blocked_by + (CASE WHEN NEW.passes = 1 THEN -1 ELSE 1 END)
+        WHERE id IN (SELECT feature_id FROM feature_dependencies WHERE depends_on_id = NEW.id);
+    END
+    """,
+    # Unblock dependents before dropping the edges; the edge delete trigger
+    # then finds no row for the deleted feature and adjusts nothing twice
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_features_dependents_delete AFTER DELETE ON features
+    BEGIN
+        UPDATE features SET blocked_by = blocked_by - 1
+        WHERE COALESCE(OLD.passes, 0) = 0
+            AND id IN (SELECT feature_id FROM feature_dependencies WHERE depends_on_id = OLD.id);
+        DELETE FROM feature_dependencies WHERE feature_id = OLD.id OR depends_on_id = OLD.id;
+    END
+    """,
+]
+
+# Append a feature_events row for every state change, whichever tool (or
+# trigger) made it. Lease renewals, version bumps and regression stamps
+# are not events. In a single UPDATE, passes wins over priority (skip),
+# which wins over the in_progress transition.
+_EVENT_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+FEATURE_EVENT_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_features_event_insert AFTER INSERT ON features
+    BEGIN
+        INSERT INTO feature_events (feature_id, group_id, event, session_id, created_at)
+        VALUES (NEW.id, NEW.parallel_group_id, 'created', NEW.dispatched_by, {_EVENT_NOW});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_features_event_update AFTER UPDATE ON features
+    WHEN NEW.passes IS NOT OLD.passes
+        OR NEW.priority IS NOT OLD.priority
+        OR NEW.in_progress IS NOT OLD.in_progress
+        OR NEW.dispatched_at IS NOT OLD.dispatched_at
+        OR (NEW.blocked_by = 0 AND OLD.blocked_by > 0)
+    BEGIN
+        INSERT INTO feature_events (feature_id, group_id, event, session_id, created_at)
+        VALUES (
+            NEW.id,
+            COALESCE(NEW.parallel_group_id, OLD.parallel_group_id),
+            CASE
+                WHEN NEW.passes IS NOT OLD.passes THEN
+                    CASE WHEN NEW.passes = 1 THEN 'passing' ELSE 'reopened' END
+                WHEN NEW.priority IS NOT OLD.priority THEN 'skipped'
+                WHEN NEW.in_progress = 1 AND (OLD.in_progress = 0 OR NEW.dispatched_at IS NOT OLD.dispatched_at) THEN 'claimed'
+                WHEN NEW.in_progress = 0 AND OLD.in_progress = 1 THEN 'released'
+                ELSE 'ready'
+            END,
+            COALESCE(NEW.dispatched_by, OLD.dispatched_by),
+            {_EVENT_NOW}
+        );
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_parallel_groups_event_insert AFTER INSERT ON parallel_groups
+    BEGIN
+        INSERT INTO feature_events (feature_id, group_id, event, session_id, created_at)
+        VALUES (NULL, NEW.id, 'group_created', NEW.parent_session, {_EVENT_NOW});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_parallel_groups_event_update AFTER UPDATE OF status ON parallel_groups
+    WHEN NEW.status IS NOT OLD.status
+    BEGIN
+        INSERT INTO feature_events (feature_id, group_id, event, session_id, created_at)
+        VALUES (NULL, NEW.id, 'group_' || NEW.status, NEW.parent_session, {_EVENT_NOW});
+    END
+    """,
+]
+
+# Single-pass aggregate used to seed (or recompute) the counters
+FEATURE_COUNTS_SQL = """
+    SELECT
+        COUNT(*),
+        COALESCE(SUM(CASE WHEN passes = 1 THEN 1 ELSE 0 END), 0),
+        COALESCE(SUM(CASE WHEN in_progress = 1 THEN 1 ELSE 0 END), 0)
+    FROM features
+"""
+
+
+def get_feature_counts(session: Session) -> tuple:
+    """Return (total, passing, in_progress) for all features.
+
+    Reads the trigger-maintained feature_stats row, falling back to a
+    single aggregate query if the row is missing.
+    """
+    row = session.execute(
+        text("SELECT total, passing, in_progress FROM feature_stats WHERE id = 1")
+    ).first()
+    if row is None:
+        row = session.execute(text(FEATURE_COUNTS_SQL)).one()
+    return tuple(row)
+
+
+def reserve_priorities(session: Session, count: int = 1) -> int:
+    """Atomically reserve a block of tail priorities.
+
+    Runs a single UPDATE ... RETURNING on the feature_stats row, which also
+    takes the database write lock, so concurrent callers always receive
+    disjoint, increasing blocks. Call it first in a write transaction; the
+    reservation is released if the transaction rolls back.
+
+    Args:
+        session: Active database session
+        count: Number of consecutive priorities to reserve
+
+    Returns:
+        The first reserved priority.
+    """
+    return session.execute(
+        text(
+            "UPDATE feature_stats SET next_priority = next_priority + :count "
+            "WHERE id = 1 RETURNING next_priority - :count"
+        ),
+        {"count": count},
+    ).scalar_one()
+
+
 def can_parallelize_categories(cat1: str, cat2: str) -> bool:
     """Check if two feature categories can be safely parallelized.
 
@@ -176,19 +671,89 @@ def can_parallelize_categories(cat1: str, cat2: str) -> bool:
     Returns:
         True if the categories can be parallelized, False otherwise.
     """
-    cat1, cat2 = cat1.upper(), cat2.upper()
+    return bool(category_mask(cat1) & category_bit(cat2))
+
+
+def category_bit(category: str) -> int:
+    """Return the bit identifying a category (0 for unknown categories)."""
+    return CATEGORY_BITS.get(category.upper(), 0)
+
+
+def category_mask(category: str) -> int:
+    """Return the bitmask of categories that can parallelize with a category.
+
+    AND the masks of several categories together to get the categories
+    compatible with all of them.
+    """
+    return CATEGORY_MASKS.get(category.upper(), 0)
 
-    # Critical categories never parallelize
-    if cat1 in CRITICAL_CATEGORIES or cat2 in CRITICAL_CATEGORIES:
-        return False
 
-    # Same category never parallelize (likely share files)
-    if cat1 == cat2:
-        return False
+def select_max_parallel(
+    categories: list,
+    compatible: int,
+    slots: int,
+    time_budget: float = 0.05,
+) -> list:
+    """Pick the largest mutually compatible subset of candidate categories.
 
-    # Check the matrix (symmetric check)
-    safe_for_cat1 = CATEGORY_PARALLELIZATION_MATRIX.get(cat1, set())
-    return cat2 in safe_for_cat1
+    Bounded branch-and-bound over the category compatibility graph
+    (maximum clique). Batches are ranked by size first, then by the sum of
+    their candidate positions, so among equally large batches the one made
+    of higher-priority candidates wins. The search starts from the greedy
+    first-fit batch and returns the best batch found when the time budget
+    runs out.
+
+    Args:
+        categories: Candidate category codes, in priority order
+        compatible: Mask of categories allowed alongside the batch
+            (e.g. the primary feature's mask)
+        slots: Maximum number of candidates to select
+        time_budget: Search time limit in seconds
+
+    Returns:
+        Indices into categories of the selected candidates, ascending.
+    """
+    bits = [category_bit(cat) for cat in categories]
+    masks = [category_mask(cat) for cat in categories]
+    deadline = time.monotonic() + time_budget
+
+    # Greedy first-fit as the starting point
+    best = []
+    allowed = compatible
+    for i, bit in enumerate(bits):
+        if len(best) < slots and allowed & bit:
+            best.append(i)
+            allowed &= masks[i]
+    best_score = (len(best), -sum(best))
+
+    chosen = []
+
+    def search(start: int, allowed: int, rank_sum: int) -> bool:
+        nonlocal best, best_score
+        score = (len(chosen), -rank_sum)
+        if score > best_score:
+            best, best_score = list(chosen), score
+        if len(chosen) == slots:
+            return True
+
+        remaining = [j for j in range(start, len(bits)) if allowed & bits[j]]
+        # Optimistic bound: take the next highest-priority remaining candidates
+        take = remaining[:slots - len(chosen)]
+        if (len(chosen) + len(take), -(rank_sum + sum(take))) <= best_score:
+            return True
+
+        for j in remaining:
+            if time.monotonic() > deadline:
+                return False
+            chosen.append(j)
+            finished = search(j + 1, allowed & masks[j], rank_sum + j)
+            chosen.pop()
+            if not finished:
+                return False
+        return True
+
+    search(0, compatible, 0)
+    return sorted(best)
 
 
 def get_database_path(project_dir: Path) -> Path:
@@ -205,67 +770,489 @@ def get_database_url(project_dir: Path) -> str:
     return f"sqlite:///{db_path.as_posix()}"
 
 
-def _migrate_database(engine) -> None:
-    """Apply all database migrations for backward compatibility."""
-    from sqlalchemy import text
+# Connection pool strategies, selected with FEATURES_DB_POOL (default: queue)
+# - static: one shared connection (StaticPool); the server then runs tools
+#   on a single worker thread
+# - queue: bounded QueuePool with pre-ping; safe for multi-threaded servers
+DEFAULT_POOL_STRATEGY = "queue"
+POOL_STRATEGIES = ("static", "queue")
+QUEUE_POOL_SIZE = 5
+QUEUE_POOL_MAX_OVERFLOW = 10
+QUEUE_POOL_TIMEOUT = 30  # seconds to wait for a free connection
+
+# Checkouts slower than this are counted as waits in PoolMetrics
+POOL_WAIT_THRESHOLD_SECONDS = 0.005
+
+
+class PoolMetrics:
+    """Connection pool counters collected from pool events.
+
+    Attributes:
+        connects: New DBAPI connections opened
+        checkouts: Connections handed out by the pool
+        checkins: Connections returned to the pool
+        invalidations: Connections discarded (e.g. failed pre-ping)
+        checked_out: Connections currently in use
+        peak_checked_out: Highest concurrent checked_out seen
+        peak_overflow: Most connections open beyond the QueuePool size
+        waits: Timed checkouts slower than POOL_WAIT_THRESHOLD_SECONDS
+        max_wait_seconds: Slowest timed checkout
+    """
+
+    def __init__(self, engine, strategy: str):
+        self._pool = engine.pool
+        self.strategy = strategy
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self.waits = 0
+        self.max_wait_seconds = 0.0
+        # Events fire on whichever thread uses the pool
+        self._lock = threading.Lock()
+
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+            self.peak_overflow = max(self.peak_overflow, self._overflow())
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def _overflow(self) -> int:
+        if isinstance(self._pool, QueuePool):
+            return max(self._pool.overflow(), 0)
+        return 0
+
+    def record_checkout_time(self, seconds: float) -> None:
+        """Record how long acquiring a connection took."""
+        with self._lock:
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            if seconds > POOL_WAIT_THRESHOLD_SECONDS:
+                self.waits += 1
+
+    def to_dict(self) -> dict:
+        """Convert metrics to dictionary for JSON serialization."""
+        return {
+            "strategy": self.strategy,
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "invalidations": self.invalidations,
+            "checked_out": self.checked_out,
+            "peak_checked_out": self.peak_checked_out,
+            "overflow": self._overflow(),
+            "peak_overflow": self.peak_overflow,
+            "waits": self.waits,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+        }
+
+
+# PoolMetrics per engine created by create_database
+_pool_metrics: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def get_pool_metrics(engine) -> Optional[PoolMetrics]:
+    """Return the PoolMetrics for an engine created by create_database."""
+    return _pool_metrics.get(engine)
+
+
+def get_pool_strategy(name: Optional[str] = None) -> str:
+    """Return the pool strategy name, validated.
+
+    Args:
+        name: Strategy name; falls back to FEATURES_DB_POOL, then the default
+    """
+    name = (name or os.environ.get("FEATURES_DB_POOL") or DEFAULT_POOL_STRATEGY).lower()
+    if name not in POOL_STRATEGIES:
+        raise ValueError(
+            f"Unknown pool strategy '{name}' (expected one of: {', '.join(POOL_STRATEGIES)})"
+        )
+    return name
+
+
+def _create_engine(db_url: str, strategy: str):
+    """Create the SQLAlchemy engine for a pool strategy."""
+    connect_args = {"check_same_thread": False}
+    if strategy == "static":
+        return create_engine(db_url, connect_args=connect_args, poolclass=StaticPool)
+    return create_engine(
+        db_url,
+        connect_args=connect_args,
+        poolclass=QueuePool,
+        pool_size=QUEUE_POOL_SIZE,
+        max_overflow=QUEUE_POOL_MAX_OVERFLOW,
+        pool_timeout=QUEUE_POOL_TIMEOUT,
+        pool_pre_ping=True,
+    )
+
+
+def get_pragma_profile(name: Optional[str] = None) -> dict:
+    """Return the PRAGMA settings for a profile.
+
+    Args:
+        name: Profile name; falls back to FEATURES_DB_PROFILE, then the default
+
+    Returns:
+        Dict of PRAGMA name -> value, in the order they should be applied.
+    """
+    name = (name or os.environ.get("FEATURES_DB_PROFILE") or DEFAULT_PRAGMA_PROFILE).lower()
+    if name not in PRAGMA_PROFILES:
+        raise ValueError(
+            f"Unknown database profile '{name}' (expected one of: {', '.join(PRAGMA_PROFILES)})"
+        )
+    return PRAGMA_PROFILES[name]
+
+
+def _install_pragma_profile(engine, pragmas: dict) -> None:
+    """Apply the PRAGMA profile to every connection the engine opens."""
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in pragmas.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+        finally:
+            cursor.close()
+
+
+def get_schema_version(engine) -> int:
+    """Return the database's schema version (0 for a new file).
+
+    Reads PRAGMA user_version; an unstamped pre-v1.8 file is dated by
+    _legacy_schema_version instead.
+    """
+    with engine.connect() as conn:
+        version = conn.exec_driver_sql("PRAGMA user_version").scalar()
+        if version == 0:
+            objects = _schema_objects(conn)
+            if "features" in objects:
+                version = _legacy_schema_version(conn, objects)
+        return version
+
+
+def _schema_objects(conn) -> set:
+    """Return the names of all tables, indexes and triggers."""
+    return {name for (name,) in conn.exec_driver_sql("SELECT name FROM sqlite_master")}
+
+
+def _create_schema(conn) -> None:
+    """Create a new, empty database directly at SCHEMA_VERSION.
+
+    create_all makes every table and index; the triggers and the seeded
+    feature_stats row are the parts the migrations would otherwise add.
+    """
+    Base.metadata.create_all(bind=conn)
+    for trigger_sql in FEATURE_STATS_TRIGGERS + DEPENDENCY_TRIGGERS + FEATURE_EVENT_TRIGGERS:
+        conn.exec_driver_sql(trigger_sql)
+    conn.exec_driver_sql(
+        "INSERT INTO feature_stats (id, total, passing, in_progress, next_priority) VALUES (1, 0, 0, 0, 1)"
+    )
+    conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def _legacy_schema_version(conn, objects: set) -> int:
+    """Work out the version of a file written before user_version was stamped.
+
+    Every version up to v1.8 left a marker (a column, trigger or table)
+    and servers applied them in order, so the version is the length of the
+    leading run of markers present. Together with _repair_legacy_schema
+    and migration 1's column checks this is the only schema inspection;
+    files from v1.8 on are stamped, so the list never grows.
+
+    Args:
+        conn: Connection to the database
+        objects: Names of all tables, indexes and triggers in sqlite_master
+    """
+    columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(features)")}
+    markers = [
+        {"in_progress", "parallel_group_id", "dispatched_by", "dispatched_at"} <= columns,
+        "trg_features_priority_insert" in objects,
+        "last_regression_at" in columns,
+        "version" in columns,
+        "lease_expires_at" in columns,
+        "blocked_by" in columns,
+        "trg_features_event_update" in objects,
+        "import_checkpoints" in objects,
+    ]
+    version = 0
+    while version < len(markers) and markers[version]:
+        version += 1
+    return version
+
+
+def _repair_legacy_schema(conn, objects: set, version: int) -> None:
+    """Create objects a dated pre-v1.8 file lacks below its version.
+
+    The markers are single objects, so a file can carry a marker without
+    everything its migration makes: v1.1 dispatch columns added by hand
+    or by another tool without parallel_groups, or unreleased builds that
+    added a column or trigger before its indexes. parallel_groups is
+    created for files at v1.1 or later, and model indexes whose table and
+    columns already exist are created; later migrations add the rest.
+    """
+    if version >= 1 and "parallel_groups" not in objects:
+        ParallelGroup.__table__.create(conn)
+        objects = _schema_objects(conn)
+    for table in Base.metadata.sorted_tables:
+        if table.name not in objects:
+            continue
+        columns = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table.name})")}
+        for index in table.indexes:
+            if index.name not in objects and {c.name for c in index.columns} <= columns:
+                index.create(conn)
+
+
+def _migration_1_dispatch(conn) -> None:
+    """v1.1: In-progress and dispatch tracking columns, parallel_groups.
+
+    v1.0 files may already have some of these (in_progress predates the
+    dispatch columns), so unlike the later migrations this one adds only
+    what is missing.
+    """
+    columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(features)")}
+    for name, ddl in [
+        ("in_progress", "BOOLEAN DEFAULT 0"),
+        ("parallel_group_id", "INTEGER"),
+        ("dispatched_by", "VARCHAR(100)"),
+        ("dispatched_at", "DATETIME"),
+    ]:
+        if name not in columns:
+            conn.exec_driver_sql(f"ALTER TABLE features ADD COLUMN {name} {ddl}")
+    ParallelGroup.__table__.create(conn, checkfirst=True)
+
+
+def _migration_2_stats(conn) -> None:
+    """v1.2: Category / parallel-group indexes and feature_stats counters.
+
+    Early v1.2 files already have feature_stats without next_priority,
+    so the table is created in that original shape and then extended.
+    The stats triggers and seed row share the migration's transaction, so
+    no write can slip in between seeding and the triggers taking effect.
+    """
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_features_category "
+        "ON features (category, priority, id, passes)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_features_parallel_group_id "
+        "ON features (parallel_group_id)"
+    )
+
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS feature_stats ("
+        "id INTEGER NOT NULL PRIMARY KEY, total INTEGER NOT NULL, "
+        "passing INTEGER NOT NULL, in_progress INTEGER NOT NULL)"
+    )
+    conn.exec_driver_sql("ALTER TABLE feature_stats ADD COLUMN next_priority INTEGER NOT NULL DEFAULT 1")
+    conn.exec_driver_sql(
+        "UPDATE feature_stats SET next_priority = "
+        "(SELECT COALESCE(MAX(priority), 0) + 1 FROM features)"
+    )
+    for trigger_sql in FEATURE_STATS_TRIGGERS:
+        conn.exec_driver_sql(trigger_sql)
+    conn.exec_driver_sql(
+        f"INSERT OR IGNORE INTO feature_stats (id, total, passing, in_progress, next_priority) "
+        f"SELECT 1, *, (SELECT COALESCE(MAX(priority), 0) + 1 FROM features) "
+        f"FROM ({FEATURE_COUNTS_SQL})"
+    )
+
+
+def _migration_3_regression(conn) -> None:
+    """v1.3: Regression tracking column, queue index and regression_runs."""
+    conn.exec_driver_sql("ALTER TABLE features ADD COLUMN last_regression_at DATETIME")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_features_regression_queue "
+        "ON features (passes, last_regression_at, id) WHERE passes = 1"
+    )
+    RegressionRun.__table__.create(conn, checkfirst=True)
+
+
+def _migration_4_version(conn) -> None:
+    """v1.4: Optimistic concurrency version column."""
+    conn.exec_driver_sql("ALTER TABLE features ADD COLUMN version INTEGER NOT NULL DEFAULT '1'")
+
+
+def _migration_5_lease(conn) -> None:
+    """v1.5: Lease column.
+
+    Existing claims get one default lease from now so abandoned ones are
+    eventually released.
+    """
+    conn.exec_driver_sql("ALTER TABLE features ADD COLUMN lease_expires_at DATETIME")
+    conn.execute(
+        text(
+            "UPDATE features SET lease_expires_at = :expires, version = version + 1 "
+            "WHERE in_progress = 1"
+        ),
+        # Same text format SQLAlchemy's DateTime writes, so comparisons hold
+        {"expires": (datetime.utcnow() + timedelta(seconds=DEFAULT_LEASE_SECONDS)).strftime("%Y-%m-%d %H:%M:%S.%f")},
+    )
 
+
+def _migration_6_dependencies(conn) -> None:
+    """v1.6: Dependency edges, unmet dependency counter and ready queue.
+
+    No edges exist yet, so blocked_by 0 is correct for every row. The
+    ready-queue index supersedes the v1.2 pending-queue index.
+    """
+    conn.exec_driver_sql("ALTER TABLE features ADD COLUMN blocked_by INTEGER NOT NULL DEFAULT '0'")
+    FeatureDependency.__table__.create(conn, checkfirst=True)
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_features_pending_queue")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_features_ready_queue "
+        "ON features (passes, blocked_by, priority, id, in_progress) WHERE passes = 0"
+    )
+    for trigger_sql in DEPENDENCY_TRIGGERS:
+        conn.exec_driver_sql(trigger_sql)
+
+
+def _migration_7_change_feed(conn) -> None:
+    """v1.7: feature_events and its triggers; the feed starts empty."""
+    FeatureEvent.__table__.create(conn, checkfirst=True)
+    for trigger_sql in FEATURE_EVENT_TRIGGERS:
+        conn.exec_driver_sql(trigger_sql)
+
+
+def _migration_8_import_checkpoints(conn) -> None:
+    """v1.8: import_checkpoints."""
+    ImportCheckpoint.__table__.create(conn, checkfirst=True)
+
+
+# Numbered schema migrations for existing files; migration N is version
+# history entry v1.N. New databases are created at SCHEMA_VERSION by
+# _create_schema instead. Each migration runs once, in its own transaction
+# with the user_version bump, on files below its number, so it can alter
+# unconditionally (only migration 1, which also sees partly upgraded v1.0
+# files, checks first). Append new migrations here for every schema change
+# (update _create_schema too if it is not covered by create_all) and never
+# edit or renumber applied ones.
+MIGRATIONS = [
+    (1, "Dispatch tracking columns", _migration_1_dispatch),
+    (2, "Category/group indexes and feature_stats counters", _migration_2_stats),
+    (3, "Regression tracking", _migration_3_regression),
+    (4, "Optimistic concurrency version", _migration_4_version),
+    (5, "In-progress leases", _migration_5_lease),
+    (6, "Feature dependencies", _migration_6_dependencies),
+    (7, "Change feed triggers", _migration_7_change_feed),
+    (8, "Import checkpoints", _migration_8_import_checkpoints),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def migrate_database(engine, dry_run: bool = False) -> list:
+    """Create a new database, or apply the migrations an existing one lacks.
+
+    A file without a features table is created directly at SCHEMA_VERSION.
+    An existing file runs every MIGRATIONS entry above its user_version
+    (pre-v1.8 files are dated once by _legacy_schema_version), each in its
+    own BEGIN IMMEDIATE transaction together with its user_version bump.
+    An interrupted upgrade stops at the last complete migration, and a
+    second server starting concurrently waits for the lock, then skips
+    what was applied meanwhile. Migration timings are logged to stderr.
+
+    Args:
+        engine: Engine for the database to migrate
+        dry_run: Only report the pending migrations; change nothing
+
+    Returns:
+        List of {"version", "description", "ms"} per migration applied
+        (pending with dry_run, ms None)
+    """
+    # Current files are stamped, so this one PRAGMA read is all they cost
     with engine.connect() as conn:
-        # Get existing columns in features table
-        result = conn.execute(text("PRAGMA table_info(features)"))
-        feature_columns = [row[1] for row in result.fetchall()]
-
-        # Migration v1.0 -> v1.1: Add in_progress column
-        if "in_progress" not in feature_columns:
-            conn.execute(text("ALTER TABLE features ADD COLUMN in_progress BOOLEAN DEFAULT 0"))
-            conn.commit()
-
-        # Migration v1.1: Add dispatch tracking columns to features
-        if "parallel_group_id" not in feature_columns:
-            conn.execute(text("ALTER TABLE features ADD COLUMN parallel_group_id INTEGER"))
-            conn.commit()
-
-        if "dispatched_by" not in feature_columns:
-            conn.execute(text("ALTER TABLE features ADD COLUMN dispatched_by VARCHAR(100)"))
-            conn.commit()
-
-        if "dispatched_at" not in feature_columns:
-            conn.execute(text("ALTER TABLE features ADD COLUMN dispatched_at DATETIME"))
-            conn.commit()
-
-        # Check if parallel_groups table exists
-        result = conn.execute(text(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='parallel_groups'"
-        ))
-        if result.fetchone() is None:
-            # Create parallel_groups table
-            conn.execute(text("""
-                CREATE TABLE parallel_groups (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    parent_session VARCHAR(100) NOT NULL,
-                    started_at DATETIME NOT NULL,
-                    status VARCHAR(20) NOT NULL DEFAULT 'active',
-                    regression_status VARCHAR(20) NOT NULL DEFAULT 'pending'
-                )
-            """))
-            conn.commit()
-
-
-def create_database(project_dir: Path) -> tuple:
+        if conn.exec_driver_sql("PRAGMA user_version").scalar() >= SCHEMA_VERSION:
+            return []
+
+    # pysqlite only opens transactions before DML, so each step begins
+    # explicitly to cover its DDL; IMMEDIATE takes the write lock up front
+    with engine.begin() as conn:
+        if not dry_run:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+        current = conn.exec_driver_sql("PRAGMA user_version").scalar()
+        if current == 0:
+            objects = _schema_objects(conn)
+            if "features" not in objects:
+                if dry_run:
+                    return [{"version": SCHEMA_VERSION, "description": "Create new database", "ms": None}]
+                _create_schema(conn)
+                return []
+            current = _legacy_schema_version(conn, objects)
+            if not dry_run:
+                _repair_legacy_schema(conn, objects, current)
+                conn.exec_driver_sql(f"PRAGMA user_version = {current}")
+
+    pending = [m for m in MIGRATIONS if m[0] > current]
+    if dry_run:
+        return [
+            {"version": version, "description": description, "ms": None}
+            for version, description, _ in pending
+        ]
+
+    applied = []
+    for version, description, upgrade in pending:
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            if conn.exec_driver_sql("PRAGMA user_version").scalar() >= version:
+                continue
+            upgrade(conn)
+            conn.exec_driver_sql(f"PRAGMA user_version = {version}")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        # stdout carries the MCP protocol, so log to stderr
+        print(f"Schema migration {version} ({description}): {elapsed_ms:.1f} ms", file=sys.stderr)
+        applied.append({"version": version, "description": description, "ms": round(elapsed_ms, 1)})
+    return applied
+
+
+def create_database(
+    project_dir: Path,
+    profile: Optional[str] = None,
+    pool: Optional[str] = None,
+) -> tuple:
     """
     Create database and return engine + session maker.
 
     Args:
         project_dir: Directory where features.db will be created
+        profile: PRAGMA profile name ("durable" or "fast"); defaults to
+            the FEATURES_DB_PROFILE environment variable
+        pool: Pool strategy ("static" or "queue"); defaults to
+            the FEATURES_DB_POOL environment variable
 
     Returns:
         Tuple of (engine, SessionLocal)
     """
+    pragmas = get_pragma_profile(profile)
+    strategy = get_pool_strategy(pool)
     db_url = get_database_url(project_dir)
-    engine = create_engine(db_url, connect_args={"check_same_thread": False})
-    Base.metadata.create_all(bind=engine)
+    engine = _create_engine(db_url, strategy)
+    _install_pragma_profile(engine, pragmas)
+    _pool_metrics[engine] = PoolMetrics(engine, strategy)
 
-    # Apply all migrations for backward compatibility
-    _migrate_database(engine)
+    # Apply pending migrations; a current database costs one PRAGMA read
+    migrate_database(engine)
 
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     return engine, SessionLocal
@@ -295,3 +1282,30 @@ def get_db() -> Session:
         yield db
     finally:
         db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Apply pending features.db schema migrations")
+    parser.add_argument("project_dir", nargs="?", default=os.environ.get("PROJECT_DIR", "."),
+                        help="Directory containing features.db (default: PROJECT_DIR or .)")
+    parser.add_argument("--dry-run", action="store_true", help="List pending migrations without applying them")
+    args = parser.parse_args()
+
+    db_path = get_database_path(Path(args.project_dir).resolve())
+    if not db_path.exists():
+        sys.exit(f"No database at {db_path}")
+    engine = _create_engine(get_database_url(db_path.parent), get_pool_strategy())
+    _install_pragma_profile(engine, get_pragma_profile())
+    try:
+        migrations = migrate_database(engine, dry_run=args.dry_run)
+        if args.dry_run:
+            for migration in migrations:
+                print(f"{migration['version']:>4}  {migration['description']}")
+            print(f"{len(migrations)} pending; database at version {get_schema_version(engine)} of {SCHEMA_VERSION}")
+        else:
+            total_ms = sum(migration["ms"] for migration in migrations)
+            print(f"Applied {len(migrations)} migrations in {total_ms:.1f} ms; database at version {get_schema_version(engine)}")
+    finally:
+        engine.dispose()
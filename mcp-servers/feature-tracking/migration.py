@@ -4,35 +4,168 @@ JSON to SQLite Migration
 
 Automatically migrates existing feature_list.json files to SQLite database.
 This provides backward compatibility with older projects that used JSON storage.
+export_to_json / import_from_json stream the database to and from JSON or
+NDJSON files, optionally gzip or zstd compressed.
 """
 
+import gzip
 import json
 import shutil
+import sys
 from datetime import datetime
+from json.decoder import WHITESPACE
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterator, Optional, TextIO
 
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session, sessionmaker
 
-from database import Feature
+from database import Feature, FeatureDependency, ImportCheckpoint
+
+# Characters read per step while streaming feature_list.json
+READ_BLOCK_SIZE = 64 * 1024
+
+# Features per import transaction; the checkpoint advances once per chunk
+IMPORT_CHUNK_SIZE = 1000
+
+# Features fetched per round trip by export_to_json
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_FORMATS = ("json", "ndjson")
+_COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+
+_decoder = json.JSONDecoder()
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+
+def _log(message: str) -> None:
+    """Print a migration message to stderr (stdout carries the MCP protocol)."""
+    print(message, file=sys.stderr)
+
+
+def iter_json_array(fp: TextIO, block_size: int = READ_BLOCK_SIZE) -> Iterator:
+    """Yield the elements of a top-level JSON array without loading it whole.
+
+    Reads fp in blocks and decodes one element at a time with
+    JSONDecoder.raw_decode, so memory use follows the largest element
+    rather than the file size.
+
+    Raises:
+        ValueError: If the content is not a JSON array or is malformed
+    """
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill() -> None:
+        nonlocal buf, pos, eof
+        block = fp.read(block_size)
+        eof = not block
+        buf = buf[pos:] + block
+        pos = 0
+
+    def next_char() -> str:
+        """Skip whitespace and return the next character ("" at end of file)."""
+        nonlocal pos
+        while True:
+            pos = WHITESPACE.match(buf, pos).end()
+            if pos < len(buf) or eof:
+                return buf[pos:pos + 1]
+            fill()
+
+    fill()
+    if next_char() != "[":
+        raise ValueError("feature_list.json must contain a JSON array")
+    pos += 1
+
+    index = 0
+    while True:
+        char = next_char()
+        if char == "]" and index == 0:
+            pos += 1
+            break
+        if index > 0:
+            if char == "]":
+                pos += 1
+                break
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' after element {index - 1}")
+            pos += 1
+            next_char()
+
+        while True:
+            try:
+                value, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise ValueError(f"Invalid JSON in element {index}: {e.msg}") from e
+                fill()
+                continue
+            if not eof and (end == len(buf) or buf[end] in _NUMBER_CHARS):
+                # A number cut at the block boundary (e.g. "35." + "5")
+                # decodes early; read on until a delimiter follows it
+                fill()
+                continue
+            break
+        pos = end
+        yield value
+        index += 1
+
+    if next_char():
+        raise ValueError("Unexpected data after the JSON array")
+
+
+def _log_progress(imported: int) -> None:
+    """Default migrate_json_to_sqlite progress callback."""
+    _log(f"Imported {imported} features...")
+
+
+def _log_partial_import(imported: int) -> None:
+    """Explain what happens to the chunks committed before a failed import."""
+    if imported:
+        _log(f"{imported} features were committed; the import resumes from there on next start")
+
+
+def _feature_row(index: int, feature_dict: dict) -> dict:
+    """Build an insert row, handling both old (no id/priority/name) and new formats."""
+    return {
+        "id": feature_dict.get("id", index + 1),
+        "priority": feature_dict.get("priority", index + 1),
+        "category": feature_dict.get("category", "uncategorized"),
+        "name": feature_dict.get("name", f"Feature {index + 1}"),
+        "description": feature_dict.get("description", ""),
+        "steps": feature_dict.get("steps", []),
+        "passes": feature_dict.get("passes", False),
+        "in_progress": False,
+    }
 
 
 def migrate_json_to_sqlite(
     project_dir: Path,
     session_maker: sessionmaker,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    progress: Optional[Callable[[int], None]] = None,
 ) -> bool:
     """
     Detect existing feature_list.json, import to SQLite, rename to backup.
 
     This function:
     1. Checks if feature_list.json exists
-    2. Checks if database already has data (skips if so)
-    3. Imports all features from JSON
+    2. Checks if database already has data (skips if so, unless an earlier
+       import of the same file was interrupted, which is resumed)
+    3. Streams features from JSON, committing every chunk_size features
+       together with an ImportCheckpoint
     4. Renames JSON file to feature_list.json.backup.<timestamp>
 
+    The file is never loaded whole, so very large legacy lists import in
+    bounded memory, and a failure only loses the current chunk.
+
     Args:
         project_dir: Directory containing the project
         session_maker: SQLAlchemy session maker
+        chunk_size: Features per transaction (default IMPORT_CHUNK_SIZE)
+        progress: Called with the running total after each committed chunk
+            (default: log to stderr)
 
     Returns:
         True if migration was performed, False if skipped
@@ -42,60 +175,91 @@ def migrate_json_to_sqlite(
     if not json_file.exists():
         return False  # No JSON file to migrate
 
-    # Check if database already has data
+    source_stat = json_file.stat()
+    resume_from = 0
+
+    # Check for an interrupted import, else whether database already has data
     session: Session = session_maker()
     try:
-        existing_count = session.query(Feature).count()
-        if existing_count > 0:
-            print(
-                f"Database already has {existing_count} features, skipping migration"
+        checkpoint = session.get(ImportCheckpoint, json_file.name)
+        if checkpoint is None:
+            existing_count = session.query(Feature).count()
+            if existing_count > 0:
+                _log(
+                    f"Database already has {existing_count} features, skipping migration"
+                )
+                return False
+        elif (checkpoint.source_size, checkpoint.source_mtime) != (
+            source_stat.st_size,
+            source_stat.st_mtime,
+        ):
+            _log(
+                "Error: feature_list.json changed since its import was interrupted "
+                f"after {checkpoint.imported} features; restore the original file, "
+                "or delete features.db to import from scratch"
             )
             return False
+        else:
+            resume_from = checkpoint.imported
+            _log(f"Resuming feature_list.json import after {resume_from} features")
     finally:
         session.close()
 
-    # Load JSON data
-    try:
-        with open(json_file, "r", encoding="utf-8") as f:
-            features_data = json.load(f)
-    except json.JSONDecodeError as e:
-        print(f"Error parsing feature_list.json: {e}")
-        return False
-    except IOError as e:
-        print(f"Error reading feature_list.json: {e}")
-        return False
-
-    if not isinstance(features_data, list):
-        print("Error: feature_list.json must contain a JSON array")
-        return False
+    if progress is None:
+        progress = _log_progress
 
-    # Import features into database
+    # Import features into database, one transaction per chunk
     session = session_maker()
+    imported = resume_from
     try:
-        imported_count = 0
-        for i, feature_dict in enumerate(features_data):
-            # Handle both old format (no id/priority/name) and new format
-            feature = Feature(
-                id=feature_dict.get("id", i + 1),
-                priority=feature_dict.get("priority", i + 1),
-                category=feature_dict.get("category", "uncategorized"),
-                name=feature_dict.get("name", f"Feature {i + 1}"),
-                description=feature_dict.get("description", ""),
-                steps=feature_dict.get("steps", []),
-                passes=feature_dict.get("passes", False),
-            )
-            session.add(feature)
-            imported_count += 1
+        with open(json_file, "r", encoding="utf-8") as f:
+            rows = []
+            for i, feature_dict in enumerate(iter_json_array(f)):
+                if i < resume_from:
+                    continue
+                if not isinstance(feature_dict, dict):
+                    raise ValueError(f"Element {i} of feature_list.json is not an object")
+                rows.append(_feature_row(i, feature_dict))
 
-        session.commit()
+                if len(rows) >= chunk_size:
+                    imported += len(rows)
+                    session.execute(insert(Feature), rows)
+                    session.merge(ImportCheckpoint(
+                        source=json_file.name,
+                        source_size=source_stat.st_size,
+                        source_mtime=source_stat.st_mtime,
+                        imported=imported,
+                        updated_at=datetime.utcnow(),
+                    ))
+                    session.commit()
+                    rows = []
+                    progress(imported)
 
-        # Verify import
-        final_count = session.query(Feature).count()
-        print(f"Migrated {final_count} features from JSON to SQLite")
+            # Last chunk and checkpoint removal commit together
+            if rows:
+                session.execute(insert(Feature), rows)
+                imported += len(rows)
+            session.query(ImportCheckpoint).filter(
+                ImportCheckpoint.source == json_file.name
+            ).delete()
+            session.commit()
 
+        _log(f"Migrated {imported} features from JSON to SQLite")
+
+    except ValueError as e:
+        session.rollback()
+        _log(f"Error parsing feature_list.json: {e}")
+        _log_partial_import(imported)
+        return False
+    except IOError as e:
+        session.rollback()
+        _log(f"Error reading feature_list.json: {e}")
+        _log_partial_import(imported)
+        return False
     except Exception as e:
         session.rollback()
-        print(f"Error during migration: {e}")
+        _log(f"Error during migration: {e}")
+        _log_partial_import(imported)
         return False
     finally:
         session.close()
@@ -106,50 +270,231 @@ def migrate_json_to_sqlite(
 
     try:
         shutil.move(json_file, backup_file)
-        print(f"Original JSON backed up to: {backup_file.name}")
+        _log(f"Original JSON backed up to: {backup_file.name}")
     except IOError as e:
-        print(f"Warning: Could not backup JSON file: {e}")
+        _log(f"Warning: Could not backup JSON file: {e}")
         # Continue anyway - the data is in the database
 
     return True
 
 
+def _detect_format(
+    path: Path, format: Optional[str], compression: Optional[str]
+) -> tuple[str, Optional[str]]:
+    """Fill in format / compression left as None from the file name suffixes.
+
+    Raises:
+        ValueError: If format or compression is not supported
+    """
+    suffixes = [suffix.lower() for suffix in path.suffixes]
+    if compression is None and suffixes:
+        compression = _COMPRESSION_SUFFIXES.get(suffixes[-1])
+    if format is None:
+        format = "ndjson" if any(s in (".ndjson", ".jsonl") for s in suffixes) else "json"
+
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported format {format!r} (expected one of {', '.join(EXPORT_FORMATS)})")
+    if compression is not None and compression not in _COMPRESSION_SUFFIXES.values():
+        raise ValueError(f"Unsupported compression {compression!r} (expected gzip or zstd)")
+    return format, compression
+
+
+def _open_text(path: Path, mode: str, compression: Optional[str]) -> TextIO:
+    """Open path for text reading ("rt") or writing ("wt"), optionally compressed."""
+    if compression == "gzip":
+        return gzip.open(path, mode, compresslevel=6, encoding="utf-8")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise RuntimeError(
+                "zstd compression requires the zstandard package (pip install zstandard)"
+            ) from e
+        return zstandard.open(path, mode, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def iter_ndjson(fp: TextIO) -> Iterator:
+    """Yield one decoded value per non-blank line of fp.
+
+    Raises:
+        ValueError: If a line is not valid JSON
+    """
+    for line_number, line in enumerate(fp, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_number}: {e.msg}") from e
+
+
+def _dependencies_for(session: Session, feature_ids: list[int]) -> dict[int, list[int]]:
+    """Map each of feature_ids that has dependencies to its depends_on IDs."""
+    dependencies: dict[int, list[int]] = {}
+    rows = session.execute(
+        select(FeatureDependency.feature_id, FeatureDependency.depends_on_id)
+        .where(FeatureDependency.feature_id.in_(feature_ids))
+        .order_by(FeatureDependency.feature_id, FeatureDependency.depends_on_id)
+    )
+    for feature_id, depends_on_id in rows:
+        dependencies.setdefault(feature_id, []).append(depends_on_id)
+    return dependencies
+
+
 def export_to_json(
     project_dir: Path,
     session_maker: sessionmaker,
     output_file: Optional[Path] = None,
+    format: Optional[str] = None,
+    compression: Optional[str] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
 ) -> Path:
     """
     Export features from database back to JSON format.
 
-    Useful for debugging or if you need to revert to the old format.
+    Useful for debugging, snapshots, or if you need to revert to the old
+    format. Features are read chunk_size at a time and written as they
+    arrive, so memory use does not grow with the database. The file is
+    written under a temporary name and renamed once complete. Features with
+    dependencies carry a depends_on_ids list.
 
     Args:
         project_dir: Directory containing the project
         session_maker: SQLAlchemy session maker
-        output_file: Output file path (default: feature_list_export.json)
+        output_file: Output file path (default: feature_list_export.json,
+            with .ndjson / .gz / .zst to match format and compression)
+        format: "json" (indented array, the original layout) or "ndjson"
+            (one compact feature per line); default from the output_file
+            suffix (.ndjson / .jsonl), else json
+        compression: None, "gzip" or "zstd" (needs the zstandard package);
+            default from the output_file suffix (.gz / .zst)
+        chunk_size: Features fetched per round trip (default EXPORT_CHUNK_SIZE)
 
     Returns:
         Path to the exported file
     """
     if output_file is None:
-        output_file = project_dir / "feature_list_export.json"
+        format = format or "json"
+        suffix = ".ndjson" if format == "ndjson" else ".json"
+        suffix += {v: k for k, v in _COMPRESSION_SUFFIXES.items()}.get(compression, "")
+        output_file = project_dir / f"feature_list_export{suffix}"
+    format, compression = _detect_format(output_file, format, compression)
 
+    tmp_file = output_file.with_name(output_file.name + ".tmp")
     session: Session = session_maker()
+    count = 0
     try:
-        features = (
-            session.query(Feature)
+        result = session.execute(
+            select(Feature)
             .order_by(Feature.priority.asc(), Feature.id.asc())
-            .all()
+            .execution_options(yield_per=chunk_size)
         )
+        with _open_text(tmp_file, "wt", compression) as f:
+            if format == "json":
+                f.write("[")
+            for features in result.scalars().partitions():
+                dependencies = _dependencies_for(session, [feature.id for feature in features])
+                for feature in features:
+                    record = feature.to_dict()
+                    if feature.id in dependencies:
+                        record["depends_on_ids"] = dependencies[feature.id]
+                    if format == "ndjson":
+                        f.write(json.dumps(record, separators=(",", ":")) + "\n")
+                    else:
+                        # Same bytes json.dump(indent=2) writes for the whole
+                        # list; encoded strings never contain a raw newline
+                        f.write(",\n  " if count else "\n  ")
+                        f.write(json.dumps(record, indent=2).replace("\n", "\n  "))
+                    count += 1
+            if format == "json":
+                f.write("\n]" if count else "]")
+        tmp_file.replace(output_file)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    finally:
+        session.close()
+
+    _log(f"Exported {count} features to {output_file}")
+    return output_file
 
-        features_data = [f.to_dict() for f in features]
 
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(features_data, f, indent=2)
+def import_from_json(
+    session_maker: sessionmaker,
+    input_file: Path,
+    format: Optional[str] = None,
+    compression: Optional[str] = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    Import a file written by export_to_json into an empty database.
+
+    The file is streamed and inserted chunk_size features per statement,
+    all in one transaction: nothing is written unless the whole file
+    imports. Feature IDs, priorities and passes are kept; in-progress state
+    is not. depends_on_ids edges are added after every feature exists, so
+    their blocked_by counts reflect the imported passes.
+
+    Args:
+        session_maker: SQLAlchemy session maker
+        input_file: File to import (feature_list.json exports work too)
+        format: "json" or "ndjson"; default from the input_file suffix
+        compression: None, "gzip" or "zstd"; default from the input_file suffix
+        chunk_size: Features per insert statement (default IMPORT_CHUNK_SIZE)
+        progress: Called with the running total after each chunk
+            (default: log to stderr)
+
+    Returns:
+        Number of features imported
+
+    Raises:
+        ValueError: If the database already has features or the file is malformed
+    """
+    format, compression = _detect_format(input_file, format, compression)
+    if progress is None:
+        progress = _log_progress
 
-        print(f"Exported {len(features_data)} features to {output_file}")
-        return output_file
+    session: Session = session_maker()
+    imported = 0
+    try:
+        existing_count = session.query(Feature).count()
+        if existing_count > 0:
+            raise ValueError(f"Database already has {existing_count} features")
+
+        with _open_text(input_file, "rt", compression) as f:
+            records = iter_ndjson(f) if format == "ndjson" else iter_json_array(f)
+            rows = []
+            dependency_rows = []
+            for i, feature_dict in enumerate(records):
+                if not isinstance(feature_dict, dict):
+                    raise ValueError(f"Element {i} of {input_file.name} is not an object")
+                row = _feature_row(i, feature_dict)
+                rows.append(row)
+                dependency_rows.extend(
+                    {"feature_id": row["id"], "depends_on_id": depends_on_id}
+                    for depends_on_id in feature_dict.get("depends_on_ids", [])
+                )
 
+                if len(rows) >= chunk_size:
+                    session.execute(insert(Feature), rows)
+                    imported += len(rows)
+                    rows = []
+                    progress(imported)
+
+            if rows:
+                session.execute(insert(Feature), rows)
+                imported += len(rows)
+            if dependency_rows:
+                session.execute(insert(FeatureDependency), dependency_rows)
+        session.commit()
+
+    except BaseException:
+        session.rollback()
+        raise
     finally:
         session.close()
+
+    _log(f"Imported {imported} features from {input_file}")
+    return imported
@@ -10,12 +10,18 @@ Core Tools:
 - feature_get_stats: Get progress statistics
 - feature_get_next: Get next feature to implement
 - feature_get_for_regression: Get random passing features for testing
+- feature_record_regression_results: Record regression check results
 - feature_mark_passing: Mark a feature as passing
 - feature_skip: Skip a feature (move to end of queue)
 - feature_mark_in_progress: Mark a feature as in-progress
 - feature_clear_in_progress: Clear in-progress status
+- feature_renew_lease: Extend the lease on an in-progress feature
+- feature_apply_batch: Apply several mark/clear/skip operations in one transaction
+- feature_claim_next: Atomically get and mark the next feature in-progress
 - feature_create_bulk: Create multiple features at once
 - feature_get_by_category: Get features by category code
+- feature_get_pool_metrics: Get connection pool metrics
+- feature_wait_for_changes: Long-poll the feature change feed
 
 Dispatch Tools (v1.1):
 - feature_get_parallelizable: Get features that can run in parallel
@@ -31,44 +37,128 @@ Database Location:
 Version History:
 - v1.0: Initial release with core feature management
 - v1.1: Added dispatch tools for parallel feature execution
+- v1.2: Added feature_claim_next for race-free single-call claiming
+- v1.3: Added regression run history and least-recently-verified selection
+- v1.4: Added expiring in-progress leases (feature_renew_lease, lease sweeper)
+- v1.5: Added feature dependencies; only features whose dependencies pass are served
+- v1.6: Added the feature_events change feed and feature_wait_for_changes
 """
 
+import asyncio
+import functools
 import json
 import os
+import random
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Literal
 
 from mcp.server.fastmcp import FastMCP
 from pydantic import Field
+from sqlalchemy import and_, case, insert, or_, select, tuple_, update
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.sql.expression import func
 
 # Import local modules
 from database import (
     Feature,
+    FeatureDependency,
+    FeatureEvent,
     ParallelGroup,
-    can_parallelize_categories,
+    RegressionRun,
+    category_bit,
+    category_mask,
     create_database,
+    get_feature_counts,
+    get_pool_metrics,
+    reserve_priorities,
+    select_max_parallel,
     CRITICAL_CATEGORIES,
+    DEFAULT_LEASE_SECONDS,
+    QUEUE_POOL_SIZE,
 )
-from migration import migrate_json_to_sqlite
 
 # Configuration from environment
 # Default to current directory, but should be set to .claude/features in production
 PROJECT_DIR = Path(os.environ.get("PROJECT_DIR", ".")).resolve()
 
+# Rows per executemany batch in feature_create_bulk
+BULK_INSERT_CHUNK_SIZE = 500
+
+# Search time limit for feature_get_parallelizable(mode="max_parallel")
+PARALLEL_SELECTION_BUDGET_SECONDS = 0.05
+
+# feature_get_for_regression sampling: suites up to the threshold are sampled
+# directly; larger ones by random ID probes (up to ATTEMPTS probes per feature)
+REGRESSION_PROBE_THRESHOLD = 200
+REGRESSION_PROBE_ATTEMPTS = 10
+# Weight of features in categories touched by active parallel groups
+REGRESSION_TOUCHED_WEIGHT = 4.0
+
+# Threads that run tool bodies off the event loop (see db_tool); defaults to
+# the QueuePool size so every worker can hold a pooled connection
+DB_WORKERS = int(os.environ.get("FEATURES_DB_WORKERS", QUEUE_POOL_SIZE))
+
+# In-progress lease length (FEATURES_LEASE_SECONDS overrides) and how often
+# the sweeper returns features with expired leases to the queue
+LEASE_SECONDS = int(os.environ.get("FEATURES_LEASE_SECONDS", DEFAULT_LEASE_SECONDS))
+LEASE_SWEEP_INTERVAL_SECONDS = 60
+
+# feature_wait_for_changes: writes through this server wake waiters at once;
+# writes by other processes are noticed within the poll interval. The
+# housekeeping task keeps the newest EVENT_RETENTION events.
+EVENT_POLL_INTERVAL_SECONDS = 0.5
+EVENT_RETENTION = 10000
+
+# FEATURES_BACKGROUND_MIGRATION=1 imports a legacy feature_list.json on a
+# database worker after startup instead of before it, so the server answers
+# the MCP handshake at once; database tools wait for the import to finish
+BACKGROUND_MIGRATION = os.environ.get("FEATURES_BACKGROUND_MIGRATION", "").lower() in ("1", "true", "yes")
+
+# Operations accepted by feature_apply_batch
+BATCH_OPS = ("mark_passing", "clear_in_progress", "skip")
+
+# Responses are compact JSON; set FEATURES_JSON_INDENT (e.g. 2) for debugging
+JSON_INDENT = int(os.environ["FEATURES_JSON_INDENT"]) if os.environ.get("FEATURES_JSON_INDENT") else None
+
+# Feature detail level accepted by the read tools
+Verbosity = Annotated[
+    Literal["ids", "summary", "full"],
+    Field(description="Feature detail: ids (id only), summary (no description/steps) or full"),
+]
+
+# Optimistic concurrency guard accepted by the single-feature write tools
+ExpectedVersion = Annotated[
+    int | None,
+    Field(default=None, description="Only apply the change if the feature is still at this version", ge=1),
+]
+
+# Lease length accepted by the tools that claim features
+LeaseSeconds = Annotated[
+    int | None,
+    Field(default=None, description="Lease length in seconds (default FEATURES_LEASE_SECONDS, 3600)", ge=1),
+]
+
 
 # Global database session maker (initialized on startup)
 _session_maker = None
 _engine = None
+_db_executor = None
+# Set (and replaced) after every mutating tool call to wake feature_wait_for_changes
+_changed = None
+# Future of the background feature_list.json import, if one was started
+_json_migration = None
 
 
 @asynccontextmanager
 async def server_lifespan(server: FastMCP):
     """Initialize database on startup, cleanup on shutdown."""
-    global _session_maker, _engine
+    global _session_maker, _engine, _db_executor, _changed, _json_migration
 
     # Create project directory if it doesn't exist
     PROJECT_DIR.mkdir(parents=True, exist_ok=True)
@@ -76,28 +166,258 @@ async def server_lifespan(server: FastMCP):
     # Initialize database
     _engine, _session_maker = create_database(PROJECT_DIR)
 
-    # Run migration if needed (converts legacy JSON to SQLite)
-    migrate_json_to_sqlite(PROJECT_DIR, _session_maker)
+    # Run migration if needed (converts legacy JSON to SQLite); the
+    # migration module is only imported when there is something to migrate
+    json_pending = (PROJECT_DIR / "feature_list.json").exists()
+    if json_pending:
+        from migration import migrate_json_to_sqlite
+    if json_pending and not BACKGROUND_MIGRATION:
+        migrate_json_to_sqlite(PROJECT_DIR, _session_maker)
+
+    # A StaticPool shares one connection, so it gets a single worker
+    workers = 1 if isinstance(_engine.pool, StaticPool) else DB_WORKERS
+    _db_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="features-db")
+    _changed = asyncio.Event()
+    housekeeping = asyncio.create_task(_housekeeping())
+
+    if json_pending and BACKGROUND_MIGRATION:
+        _json_migration = asyncio.get_running_loop().run_in_executor(
+            _db_executor, migrate_json_to_sqlite, PROJECT_DIR, _session_maker
+        )
 
     yield
 
     # Cleanup
+    housekeeping.cancel()
+    try:
+        await housekeeping
+    except asyncio.CancelledError:
+        pass
+    _db_executor.shutdown(wait=True)
+    _db_executor = None
+    _json_migration = None
     if _engine:
         _engine.dispose()
 
 
-# Initialize the MCP server
+# Initialize the MCP server. Tools are registered with structured_output=False:
+# they already return JSON text, and FastMCP would otherwise repeat every
+# response as structuredContent and build an output model per tool at import.
 mcp = FastMCP("features", lifespan=server_lifespan)
 
 
 def get_session():
-    """Get a new database session."""
+    """Get a new database session with its connection already checked out.
+
+    Checking out eagerly lets the pool metrics time how long each tool
+    waited for a connection.
+    """
     if _session_maker is None:
         raise RuntimeError("Database not initialized")
-    return _session_maker()
+    session = _session_maker()
+    metrics = get_pool_metrics(session.get_bind())
+    if metrics is not None:
+        started = time.perf_counter()
+        session.connection()
+        metrics.record_checkout_time(time.perf_counter() - started)
+    return session
+
+
+def db_tool(fn=None, *, mutates: bool = False):
+    """Run a blocking tool body on the database executor.
+
+    FastMCP calls sync tools on the event loop thread, so one slow query
+    would stall every other request. The wrapper keeps the tool's name,
+    docstring and signature, which FastMCP uses to build the tool schema.
+    While a background feature_list.json import runs, tools wait for it
+    rather than answer from a partial feature list.
+
+    Use @db_tool(mutates=True) for tools that change feature or group
+    state recorded by the change feed; only those wake
+    feature_wait_for_changes waiters.
+    """
+    if fn is None:
+        return functools.partial(db_tool, mutates=mutates)
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if _db_executor is None:
+            return fn(*args, **kwargs)
+        if _json_migration is not None and not _json_migration.done():
+            # wait() neither raises nor cancels the import if this call is cancelled
+            await asyncio.wait([_json_migration])
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(_db_executor, functools.partial(fn, *args, **kwargs))
+        finally:
+            if mutates:
+                _notify_changes()
+
+    return wrapper
+
+
+def _notify_changes() -> None:
+    """Wake feature_wait_for_changes waiters (event loop thread only).
+
+    Called after mutating tools and lease sweeps. A mutating call that
+    ends up writing nothing causes a spurious wake-up, which costs each
+    waiter one indexed query.
+    """
+    global _changed
+    if _changed is not None:
+        _changed.set()
+        _changed = asyncio.Event()
+
+
+def version_conflict(session, feature_id: int) -> str:
+    """Build the error returned when a feature changed under the caller."""
+    current = session.query(Feature.version).filter(Feature.id == feature_id).scalar()
+    return to_json({
+        "error": f"Feature with ID {feature_id} was modified by another session, re-read it and retry",
+        "conflict": True,
+        "current_version": current,
+    })
+
+
+def lease_until(lease_seconds: int | None) -> datetime:
+    """Expiry time for a lease starting now."""
+    return datetime.utcnow() + timedelta(seconds=lease_seconds or LEASE_SECONDS)
+
+
+def active_group_ids():
+    """Subquery of the IDs of active parallel groups."""
+    return select(ParallelGroup.id).where(ParallelGroup.status == "active")
+
+
+def claimable(now: datetime):
+    """Filter for features free to claim: not in progress, or lease expired.
+
+    Members of an active parallel group are reserved for that group, even
+    once their lease lapses, so the group never loses an unfinished feature.
+    """
+    return and_(
+        or_(Feature.in_progress == False, Feature.lease_expires_at < now),
+        or_(Feature.parallel_group_id.is_(None), Feature.parallel_group_id.not_in(active_group_ids())),
+    )
+
+
+def release_expired_leases() -> list[int]:
+    """Return features whose lease has expired to the pending queue.
+
+    Clears the claim but keeps parallel group membership, so an active
+    group still counts the feature as unfinished. Its parent session can
+    claim it again with feature_mark_in_progress, or abort the group to
+    release it for everyone.
+
+    Returns:
+        IDs of the released features
+    """
+    session = get_session()
+    try:
+        released = session.execute(
+            update(Feature)
+            .where(Feature.in_progress == True, Feature.lease_expires_at < datetime.utcnow())
+            .values(
+                in_progress=False,
+                lease_expires_at=None,
+                dispatched_by=None,
+                dispatched_at=None,
+                version=Feature.version + 1,
+            )
+            .returning(Feature.id)
+        ).scalars().all()
+        session.commit()
+        return sorted(released)
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def prune_events() -> int:
+    """Delete all but the newest EVENT_RETENTION change feed events.
+
+    Returns:
+        Number of events deleted
+    """
+    session = get_session()
+    try:
+        deleted = session.execute(
+            FeatureEvent.__table__.delete().where(
+                FeatureEvent.seq <= select(func.max(FeatureEvent.seq) - EVENT_RETENTION).scalar_subquery()
+            )
+        ).rowcount
+        session.commit()
+        return deleted
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def read_events(since_seq: int, group_id: int | None, limit: int) -> dict:
+    """Read change feed events after since_seq, oldest first.
+
+    Returns:
+        Dict with events, last_seq (pass back as since_seq; advances past
+        events filtered out by group_id) and truncated (events after
+        since_seq were already pruned)
+    """
+    session = get_session()
+    try:
+        first_seq, max_seq = session.execute(
+            select(func.min(FeatureEvent.seq), func.max(FeatureEvent.seq))
+        ).one()
+        if max_seq is None or max_seq <= since_seq:
+            return {"events": [], "last_seq": since_seq, "truncated": False}
+
+        query = (
+            select(FeatureEvent)
+            .where(FeatureEvent.seq > since_seq, FeatureEvent.seq <= max_seq)
+            .order_by(FeatureEvent.seq.asc())
+            .limit(limit)
+        )
+        if group_id is not None:
+            query = query.where(FeatureEvent.group_id == group_id)
+        events = session.scalars(query).all()
+
+        return {
+            "events": [event.to_dict() for event in events],
+            "last_seq": events[-1].seq if len(events) == limit else max_seq,
+            "truncated": first_seq > since_seq + 1,
+        }
+    finally:
+        session.close()
 
 
-@mcp.tool()
+async def _housekeeping():
+    """Release expired leases and prune the change feed periodically."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(LEASE_SWEEP_INTERVAL_SECONDS)
+        try:
+            released = await loop.run_in_executor(_db_executor, release_expired_leases)
+            await loop.run_in_executor(_db_executor, prune_events)
+        except Exception as e:
+            # stdout carries the MCP protocol, so log to stderr
+            print(f"Housekeeping failed: {e}", file=sys.stderr)
+            continue
+        if released:
+            print(f"Released expired leases: {released}", file=sys.stderr)
+            _notify_changes()
+
+
+def to_json(data) -> str:
+    """Serialize a tool response (compact unless FEATURES_JSON_INDENT is set)."""
+    if JSON_INDENT is None:
+        return json.dumps(data, separators=(",", ":"))
+    return json.dumps(data, indent=JSON_INDENT)
+
+
+@mcp.tool(structured_output=False)
+@db_tool
 def feature_get_stats() -> str:
     """Get statistics about feature completion progress.
 
@@ -109,27 +429,30 @@ def feature_get_stats() -> str:
     """
     session = get_session()
     try:
-        total = session.query(Feature).count()
-        passing = session.query(Feature).filter(Feature.passes == True).count()
-        in_progress = session.query(Feature).filter(Feature.in_progress == True).count()
+        total, passing, in_progress = get_feature_counts(session)
         percentage = round((passing / total) * 100, 1) if total > 0 else 0.0
 
-        return json.dumps({
+        return to_json({
             "passing": passing,
             "in_progress": in_progress,
             "total": total,
             "percentage": percentage
-        }, indent=2)
+        })
     finally:
         session.close()
 
 
-@mcp.tool()
-def feature_get_next() -> str:
+@mcp.tool(structured_output=False)
+@db_tool
+def feature_get_next(verbosity: Verbosity = "full") -> str:
     """Get the highest-priority pending feature to work on.
 
-    Returns the feature with the lowest priority number that has passes=false.
-    Use this at the start of each coding session to determine what to implement next.
+    Returns the feature with the lowest priority number that has passes=false
+    and whose dependencies all pass. Use this at the start of each coding
+    session to determine what to implement next.
+
+    Args:
+        verbosity: Feature detail level (ids, summary, full; default full)
 
     Returns:
         JSON with feature details (id, priority, category, name, description, steps, passes, in_progress)
@@ -139,22 +462,132 @@ def feature_get_next() -> str:
     try:
         feature = (
             session.query(Feature)
-            .filter(Feature.passes == False)
+            .filter(Feature.passes == False, Feature.blocked_by == 0)
             .order_by(Feature.priority.asc(), Feature.id.asc())
             .first()
         )
 
         if feature is None:
-            return json.dumps({"error": "All features are passing! No more work to do."})
+            total, passing, _ = get_feature_counts(session)
+            if passing < total:
+                return to_json({
+                    "error": f"No ready features: all {total - passing} pending features are waiting on dependencies"
+                })
+            return to_json({"error": "All features are passing! No more work to do."})
 
-        return json.dumps(feature.to_dict(), indent=2)
+        return to_json(feature.to_dict(verbosity))
     finally:
         session.close()
 
 
-@mcp.tool()
+def _sample_passing_ids(
+    session,
+    limit: int,
+    passing_count: int,
+    exclude_categories: frozenset = frozenset(),
+    only_categories: frozenset = frozenset(),
+) -> list[int]:
+    """Uniformly sample passing feature IDs in O(limit) index lookups.
+
+    Probes random IDs between the lowest and highest candidate ID and seeks
+    the first candidate at or after each probe (ix_features_passes). Only
+    exact hits are accepted, which keeps the sample uniform; if the probe
+    budget runs out, the nearest following features fill the rest. Small
+    candidate sets are sampled directly instead.
+
+    Args:
+        session: Active database session
+        limit: Number of IDs to sample
+        passing_count: Number of candidates (passing, in the chosen categories)
+        exclude_categories: Categories to leave out of the sample
+        only_categories: If given, sample only these categories
+    """
+    candidates = select(Feature.id).where(Feature.passes == True)
+    if exclude_categories:
+        candidates = candidates.where(Feature.category.notin_(exclude_categories))
+    if only_categories:
+        candidates = candidates.where(Feature.category.in_(only_categories))
+
+    if limit <= 0 or passing_count <= 0:
+        return []
+    if passing_count <= REGRESSION_PROBE_THRESHOLD:
+        ids = session.scalars(candidates).all()
+        return random.sample(ids, min(limit, len(ids)))
+
+    first = candidates.limit(1)
+    low = session.scalar(first.order_by(Feature.id.asc()))
+    high = session.scalar(first.order_by(Feature.id.desc()))
+
+    sampled = set()
+    fallback = set()
+    for _ in range(limit * REGRESSION_PROBE_ATTEMPTS):
+        if len(sampled) >= limit:
+            break
+        probe = random.randint(low, high)
+        found = session.scalar(first.where(Feature.id >= probe).order_by(Feature.id.asc()))
+        (sampled if found == probe else fallback).add(found)
+
+    fallback -= sampled
+    while len(sampled) < limit and fallback:
+        sampled.add(fallback.pop())
+    return list(sampled)
+
+
+def _weighted_sample_passing_ids(session, limit: int, passing_count: int) -> list[int]:
+    """Sample passing feature IDs, favoring categories in active parallel groups.
+
+    Features in categories an active parallel group is changing are the
+    most likely to be broken by in-flight work, so each of them weighs
+    REGRESSION_TOUCHED_WEIGHT against 1 for every other passing feature.
+    Draws are made one at a time without replacement: each draw picks the
+    touched or untouched pool in proportion to its remaining weight, then
+    a uniform feature from that pool. Both pools are then sampled with
+    _sample_passing_ids, so only their sizes are counted, never listed.
+    """
+    touched = frozenset(session.scalars(
+        select(Feature.category)
+        .where(Feature.parallel_group_id.in_(active_group_ids()))
+        .distinct()
+    ))
+    if not touched:
+        return _sample_passing_ids(session, limit, passing_count)
+
+    # Filtering on category alone (passes goes in the aggregate FILTER)
+    # lets SQLite count from the covering ix_features_category instead of
+    # visiting every passing row through ix_features_passes
+    touched_count = session.scalar(
+        select(func.count().filter(Feature.passes == True))
+        .select_from(Feature)
+        .where(Feature.category.in_(touched))
+    )
+    touched_left = touched_count
+    other_left = passing_count - touched_left
+
+    touched_draws = 0
+    for _ in range(min(limit, passing_count)):
+        touched_weight = REGRESSION_TOUCHED_WEIGHT * touched_left
+        if random.random() * (touched_weight + other_left) < touched_weight:
+            touched_draws += 1
+            touched_left -= 1
+        else:
+            other_left -= 1
+
+    return _sample_passing_ids(
+        session, touched_draws, touched_count, only_categories=touched
+    ) + _sample_passing_ids(
+        session,
+        min(limit, passing_count) - touched_draws,
+        passing_count - touched_count,
+        exclude_categories=touched,
+    )
+
+
+@mcp.tool(structured_output=False)
+@db_tool
 def feature_get_for_regression(
-    limit: Annotated[int, Field(default=3, ge=1, le=10, description="Maximum number of passing features to return")] = 3
+    limit: Annotated[int, Field(default=3, ge=1, le=10, description="Maximum number of passing features to return")] = 3,
+    mode: Annotated[Literal["random", "weighted", "least_recent"], Field(default="random", description="random: uniform sample; weighted: favor categories touched by active parallel groups; least_recent: least recently regression-checked first")] = "random",
+    verbosity: Verbosity = "full"
 ) -> str:
     """Get random passing features for regression testing.
 
@@ -162,33 +595,132 @@ def feature_get_for_regression(
     Use this to verify that previously implemented features still work
     after making changes.
 
+    In weighted mode, features in categories that an active parallel
+    group is changing are more likely to be picked. In least_recent mode,
+    features that were never regression-checked come first, then those
+    checked longest ago, so repeated runs cover the whole suite; record
+    results with feature_record_regression_results.
+
     Args:
         limit: Maximum number of features to return (1-10, default 3)
+        mode: Selection strategy, "random" (default), "weighted" or "least_recent"
+        verbosity: Feature detail level (ids, summary, full; default full)
 
     Returns:
         JSON with: features (list of feature objects), count (int)
     """
     session = get_session()
     try:
-        features = (
-            session.query(Feature)
-            .filter(Feature.passes == True)
-            .order_by(func.random())
-            .limit(limit)
-            .all()
-        )
+        if mode == "least_recent":
+            features = session.scalars(
+                select(Feature)
+                .where(Feature.passes == True)
+                .order_by(Feature.last_regression_at.asc(), Feature.id.asc())
+                .limit(limit)
+            ).all()
+        else:
+            _, passing_count, _ = get_feature_counts(session)
+            if mode == "weighted":
+                feature_ids = _weighted_sample_passing_ids(session, limit, passing_count)
+            else:
+                feature_ids = _sample_passing_ids(session, limit, passing_count)
 
-        return json.dumps({
-            "features": [f.to_dict() for f in features],
+            features = session.scalars(select(Feature).where(Feature.id.in_(feature_ids))).all()
+            random.shuffle(features)
+
+        return to_json({
+            "features": [f.to_dict(verbosity) for f in features],
             "count": len(features)
-        }, indent=2)
+        })
     finally:
         session.close()
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
+@db_tool
+def feature_record_regression_results(
+    results: Annotated[list[dict], Field(description="Regression results, each with feature_id, result (passed/failed) and optional duration_seconds")],
+    session_id: Annotated[str | None, Field(default=None, description="Optional session ID that ran the checks")] = None
+) -> str:
+    """Record the outcome of regression checks in one transaction.
+
+    Appends a regression run per result and stamps each feature's
+    last_regression_at, which feature_get_for_regression(mode="least_recent")
+    uses to pick the least recently verified features next. Recording a
+    failure does not change the feature's passes flag; follow the
+    regression failure protocol to fix or re-open it.
+
+    Args:
+        results: List of results, each with:
+            - feature_id (int): The feature that was checked
+            - result (str): "passed" or "failed"
+            - duration_seconds (float, optional): How long the check took
+        session_id: Optional session ID that ran the checks
+
+    Returns:
+        JSON with: recorded (int), passed (int), failed (int), failed_feature_ids (list[int])
+    """
+    # Validate everything before touching the database
+    for i, item in enumerate(results):
+        if not isinstance(item, dict) or not isinstance(item.get("feature_id"), int):
+            return to_json({"error": f"Result at index {i} missing integer feature_id"})
+        if item.get("result") not in ("passed", "failed"):
+            return to_json({"error": f"Result at index {i} must have result 'passed' or 'failed'"})
+        duration = item.get("duration_seconds")
+        if duration is not None and not isinstance(duration, (int, float)):
+            return to_json({"error": f"Result at index {i} has non-numeric duration_seconds"})
+
+    if not results:
+        return to_json({"error": "No results provided"})
+
+    session = get_session()
+    try:
+        feature_ids = {item["feature_id"] for item in results}
+        found = set(session.scalars(select(Feature.id).where(Feature.id.in_(feature_ids))))
+        missing = sorted(feature_ids - found)
+        if missing:
+            return to_json({"error": "Some features were not found", "details": missing})
+
+        run_at = datetime.utcnow()
+        session.execute(
+            insert(RegressionRun),
+            [
+                {
+                    "feature_id": item["feature_id"],
+                    "session_id": session_id,
+                    "result": item["result"],
+                    "run_at": run_at,
+                    "duration_seconds": item.get("duration_seconds"),
+                }
+                for item in results
+            ],
+        )
+        session.execute(
+            update(Feature)
+            .where(Feature.id.in_(feature_ids))
+            .values(last_regression_at=run_at, version=Feature.version + 1)
+        )
+        session.commit()
+
+        failed = [item["feature_id"] for item in results if item["result"] == "failed"]
+        return to_json({
+            "recorded": len(results),
+            "passed": len(results) - len(failed),
+            "failed": len(failed),
+            "failed_feature_ids": sorted(set(failed)),
+        })
+    except Exception as e:
+        session.rollback()
+        return to_json({"error": str(e)})
+    finally:
+        session.close()
+
+
+@mcp.tool(structured_output=False)
+@db_tool(mutates=True)
 def feature_mark_passing(
-    feature_id: Annotated[int, Field(description="The ID of the feature to mark as passing", ge=1)]
+    feature_id: Annotated[int, Field(description="The ID of the feature to mark as passing", ge=1)],
+    expected_version: ExpectedVersion = None
 ) -> str:
     """Mark a feature as passing after successful implementation.
 
@@ -197,6 +729,8 @@ def feature_mark_passing(
 
     Args:
         feature_id: The ID of the feature to mark as passing
+        expected_version: Optional version from an earlier read; the change is
+            rejected with a conflict error if the feature has changed since
 
     Returns:
         JSON with the updated feature details, or error if not found.
@@ -206,82 +740,117 @@ def feature_mark_passing(
         feature = session.query(Feature).filter(Feature.id == feature_id).first()
 
         if feature is None:
-            return json.dumps({"error": f"Feature with ID {feature_id} not found"})
+            return to_json({"error": f"Feature with ID {feature_id} not found"})
+
+        if expected_version is not None and feature.version != expected_version:
+            return version_conflict(session, feature_id)
 
         feature.passes = True
         feature.in_progress = False
+        feature.lease_expires_at = None
         session.commit()
         session.refresh(feature)
 
-        return json.dumps(feature.to_dict(), indent=2)
+        return to_json(feature.to_dict())
+    except StaleDataError:
+        session.rollback()
+        return version_conflict(session, feature_id)
     finally:
         session.close()
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
+@db_tool(mutates=True)
 def feature_skip(
-    feature_id: Annotated[int, Field(description="The ID of the feature to skip", ge=1)]
+    feature_id: Annotated[int, Field(description="The ID of the feature to skip", ge=1)],
+    expected_version: ExpectedVersion = None
 ) -> str:
     """Skip a feature by moving it to the end of the priority queue.
 
     Use this when a feature cannot be implemented yet due to:
-    - Dependencies on other features that aren't implemented yet
+    - Dependencies on other features that aren't implemented yet (declare
+      them with depends_on in feature_create_bulk to avoid the round trip)
     - External blockers (missing assets, unclear requirements)
     - Technical prerequisites that need to be addressed first
 
-    The feature's priority is set to max_priority + 1, so it will be
-    worked on after all other pending features. Also clears the in_progress
+    The feature's priority is set to the next free tail priority, so it
+    will be worked on after all other pending features. Also clears the in_progress
     flag so the feature returns to "pending" status.
 
     Args:
         feature_id: The ID of the feature to skip
+        expected_version: Optional version from an earlier read; the change is
+            rejected with a conflict error if the feature has changed since
 
     Returns:
         JSON with skip details: id, name, old_priority, new_priority, message
     """
     session = get_session()
     try:
+        # Reserve the tail priority first: this takes the write lock, so the
+        # read below is current and concurrent skips get distinct priorities
+        new_priority = reserve_priorities(session)
+
         feature = session.query(Feature).filter(Feature.id == feature_id).first()
 
         if feature is None:
-            return json.dumps({"error": f"Feature with ID {feature_id} not found"})
+            return to_json({"error": f"Feature with ID {feature_id} not found"})
 
         if feature.passes:
-            return json.dumps({"error": "Cannot skip a feature that is already passing"})
+            return to_json({"error": "Cannot skip a feature that is already passing"})
 
-        old_priority = feature.priority
+        if expected_version is not None and feature.version != expected_version:
+            return version_conflict(session, feature_id)
 
-        # Get max priority and set this feature to max + 1
-        max_priority_result = session.query(Feature.priority).order_by(Feature.priority.desc()).first()
-        new_priority = (max_priority_result[0] + 1) if max_priority_result else 1
+        old_priority = feature.priority
 
         feature.priority = new_priority
         feature.in_progress = False
+        feature.lease_expires_at = None
         session.commit()
         session.refresh(feature)
 
-        return json.dumps({
+        return to_json({
             "id": feature.id,
             "name": feature.name,
             "old_priority": old_priority,
             "new_priority": new_priority,
             "message": f"Feature '{feature.name}' moved to end of queue"
-        }, indent=2)
+        })
+    except StaleDataError:
+        session.rollback()
+        return version_conflict(session, feature_id)
     finally:
         session.close()
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
+@db_tool(mutates=True)
 def feature_mark_in_progress(
-    feature_id: Annotated[int, Field(description="The ID of the feature to mark as in-progress", ge=1)]
+    feature_id: Annotated[int, Field(description="The ID of the feature to mark as in-progress", ge=1)],
+    session_id: Annotated[str | None, Field(default=None, description="Optional session ID recorded as dispatched_by on the feature")] = None,
+    expected_version: ExpectedVersion = None,
+    lease_seconds: LeaseSeconds = None
 ) -> str:
     """Mark a feature as in-progress. Call immediately after feature_get_next().
 
     This prevents other agent sessions from working on the same feature.
-    Use this as soon as you retrieve a feature to work on.
+    Use this as soon as you retrieve a feature to work on. Prefer
+    feature_claim_next() when several agents share the same database.
+
+    The claim is a lease: renew it with feature_renew_lease() during long
+    work, or the feature returns to the pending queue when it expires. A
+    feature whose lease has expired is taken over (and detached from its
+    parallel group), as in feature_claim_next(). Members of an active
+    parallel group can only be claimed by the group's parent session,
+    which keeps them in the group.
 
     Args:
         feature_id: The ID of the feature to mark as in-progress
+        session_id: Optional session ID stamped into dispatched_by
+        expected_version: Optional version from an earlier read; the change is
+            rejected with a conflict error if the feature has changed since
+        lease_seconds: Lease length (default FEATURES_LEASE_SECONDS)
 
     Returns:
         JSON with the updated feature details, or error if not found or already in-progress.
@@ -291,26 +860,115 @@ def feature_mark_in_progress(
         feature = session.query(Feature).filter(Feature.id == feature_id).first()
 
         if feature is None:
-            return json.dumps({"error": f"Feature with ID {feature_id} not found"})
+            return to_json({"error": f"Feature with ID {feature_id} not found"})
 
         if feature.passes:
-            return json.dumps({"error": f"Feature with ID {feature_id} is already passing"})
+            return to_json({"error": f"Feature with ID {feature_id} is already passing"})
+
+        if feature.in_progress and not feature.lease_expired(datetime.utcnow()):
+            return to_json({"error": f"Feature with ID {feature_id} is already in-progress"})
+
+        if feature.blocked_by:
+            return to_json({"error": f"Feature with ID {feature_id} is waiting on {feature.blocked_by} unfinished dependencies"})
+
+        group = feature.parallel_group
+        regroup = group is not None and group.status == "active"
+        if regroup and session_id != group.parent_session:
+            return to_json({
+                "error": f"Feature with ID {feature_id} belongs to active parallel group {group.id}; "
+                         f"only its parent session {group.parent_session} can claim it"
+            })
 
-        if feature.in_progress:
-            return json.dumps({"error": f"Feature with ID {feature_id} is already in-progress"})
+        if expected_version is not None and feature.version != expected_version:
+            return version_conflict(session, feature_id)
 
+        # Same stamping as feature_claim_next, so a takeover leaves the old
+        # claimant's group and session behind (a parent re-claiming an
+        # active group's member keeps it in the group)
         feature.in_progress = True
+        feature.parallel_group_id = group.id if regroup else None
+        feature.dispatched_by = session_id
+        feature.dispatched_at = datetime.utcnow()
+        feature.lease_expires_at = lease_until(lease_seconds)
         session.commit()
         session.refresh(feature)
 
-        return json.dumps(feature.to_dict(), indent=2)
+        return to_json(feature.to_dict())
+    except StaleDataError:
+        session.rollback()
+        return version_conflict(session, feature_id)
+    finally:
+        session.close()
+
+
+@mcp.tool(structured_output=False)
+@db_tool(mutates=True)
+def feature_claim_next(
+    session_id: Annotated[str | None, Field(default=None, description="Optional session ID recorded as dispatched_by on the claimed feature")] = None,
+    verbosity: Verbosity = "full",
+    lease_seconds: LeaseSeconds = None
+) -> str:
+    """Atomically claim the highest-priority pending feature.
+
+    Combines feature_get_next() and feature_mark_in_progress() into a single
+    UPDATE ... RETURNING statement, so concurrent agents never receive the
+    same feature. Features that are already in-progress are not claimable
+    until their lease expires; an expired feature is taken over (and
+    detached from a finished parallel group). Members of an active
+    parallel group and features waiting on dependencies are never claimed.
+
+    Args:
+        session_id: Optional session ID stamped into dispatched_by
+        verbosity: Feature detail level (ids, summary, full; default full)
+        lease_seconds: Lease length (default FEATURES_LEASE_SECONDS)
+
+    Returns:
+        JSON with the claimed feature details, or error if nothing is pending.
+    """
+    session = get_session()
+    try:
+        now = datetime.utcnow()
+        next_id = (
+            select(Feature.id)
+            .where(Feature.passes == False, Feature.blocked_by == 0, claimable(now))
+            .order_by(Feature.priority.asc(), Feature.id.asc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        feature = session.execute(
+            update(Feature)
+            .where(Feature.id == next_id, claimable(now))
+            .values(
+                in_progress=True,
+                lease_expires_at=lease_until(lease_seconds),
+                parallel_group_id=None,
+                dispatched_by=session_id,
+                dispatched_at=now,
+                version=Feature.version + 1,
+            )
+            .returning(Feature)
+        ).scalar_one_or_none()
+
+        if feature is None:
+            session.rollback()
+            return to_json({"error": "No pending features available to claim"})
+
+        result = feature.to_dict(verbosity)
+        session.commit()
+
+        return to_json(result)
+    except Exception as e:
+        session.rollback()
+        return to_json({"error": str(e)})
     finally:
         session.close()
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
+@db_tool(mutates=True)
 def feature_clear_in_progress(
-    feature_id: Annotated[int, Field(description="The ID of the feature to clear in-progress status", ge=1)]
+    feature_id: Annotated[int, Field(description="The ID of the feature to clear in-progress status", ge=1)],
+    expected_version: ExpectedVersion = None
 ) -> str:
     """Clear in-progress status from a feature.
 
@@ -319,6 +977,8 @@ def feature_clear_in_progress(
 
     Args:
         feature_id: The ID of the feature to clear in-progress status
+        expected_version: Optional version from an earlier read; the change is
+            rejected with a conflict error if the feature has changed since
 
     Returns:
         JSON with the updated feature details, or error if not found.
@@ -328,25 +988,209 @@ def feature_clear_in_progress(
         feature = session.query(Feature).filter(Feature.id == feature_id).first()
 
         if feature is None:
-            return json.dumps({"error": f"Feature with ID {feature_id} not found"})
+            return to_json({"error": f"Feature with ID {feature_id} not found"})
+
+        if expected_version is not None and feature.version != expected_version:
+            return version_conflict(session, feature_id)
 
         feature.in_progress = False
+        feature.lease_expires_at = None
         session.commit()
         session.refresh(feature)
 
-        return json.dumps(feature.to_dict(), indent=2)
+        return to_json(feature.to_dict())
+    except StaleDataError:
+        session.rollback()
+        return version_conflict(session, feature_id)
+    finally:
+        session.close()
+
+
+@mcp.tool(structured_output=False)
+@db_tool
+def feature_renew_lease(
+    feature_id: Annotated[int, Field(description="The ID of the in-progress feature", ge=1)],
+    session_id: Annotated[str | None, Field(default=None, description="Optional session ID; rejects the renewal if another session has claimed the feature")] = None,
+    lease_seconds: LeaseSeconds = None
+) -> str:
+    """Extend the lease on an in-progress feature (heartbeat).
+
+    Call periodically during long work. A feature whose lease expires is
+    claimable again by other agents and is released by the lease sweeper.
+
+    Args:
+        feature_id: The ID of the in-progress feature
+        session_id: Optional session ID compared against dispatched_by
+        lease_seconds: New lease length from now (default FEATURES_LEASE_SECONDS)
+
+    Returns:
+        JSON with id, lease_expires_at and version, or error if the feature
+        is no longer in progress or belongs to another session.
+    """
+    session = get_session()
+    try:
+        feature = session.query(Feature).filter(Feature.id == feature_id).first()
+
+        if feature is None:
+            return to_json({"error": f"Feature with ID {feature_id} not found"})
+
+        if not feature.in_progress:
+            return to_json({"error": f"Feature with ID {feature_id} is not in progress (its lease may have been released)"})
+
+        if session_id is not None and feature.dispatched_by not in (None, session_id):
+            return to_json({"error": f"Feature with ID {feature_id} is claimed by session {feature.dispatched_by}"})
+
+        feature.lease_expires_at = lease_until(lease_seconds)
+        session.commit()
+        session.refresh(feature)
+
+        return to_json({
+            "id": feature.id,
+            "lease_expires_at": feature.lease_expires_at.isoformat(),
+            "version": feature.version,
+        })
+    except StaleDataError:
+        session.rollback()
+        return version_conflict(session, feature_id)
+    finally:
+        session.close()
+
+
+@mcp.tool(structured_output=False)
+@db_tool(mutates=True)
+def feature_apply_batch(
+    operations: Annotated[list[dict], Field(description="Operations, each with id, op (mark_passing, clear_in_progress or skip) and optional expected_version")],
+    atomic: Annotated[bool, Field(description="Roll back every operation if any one fails")] = False
+) -> str:
+    """Apply several feature updates in a single transaction.
+
+    Use this instead of one feature_mark_passing / feature_clear_in_progress /
+    feature_skip call per feature, e.g. when finishing a parallel group.
+    Operations run in order with the same checks as the single-feature
+    tools; a failed operation is reported in its result and, unless atomic
+    is set, does not stop the others.
+
+    Args:
+        operations: List of operations, each with:
+            - id (int): The feature ID
+            - op (str): "mark_passing", "clear_in_progress" or "skip"
+            - expected_version (int, optional): Reject the operation unless
+              the feature is still at this version
+        atomic: If true, nothing is written when any operation fails
+
+    Returns:
+        JSON with: applied (int), failed (int), results (list of
+        {id, op, ok, error?, priority?} in request order)
+    """
+    # Validate everything before touching the database
+    for i, item in enumerate(operations):
+        if not isinstance(item, dict) or not isinstance(item.get("id"), int):
+            return to_json({"error": f"Operation at index {i} missing integer id"})
+        if item.get("op") not in BATCH_OPS:
+            return to_json({"error": f"Operation at index {i} must have op in {', '.join(BATCH_OPS)}"})
+        expected = item.get("expected_version")
+        if expected is not None and not isinstance(expected, int):
+            return to_json({"error": f"Operation at index {i} has non-integer expected_version"})
+
+    if not operations:
+        return to_json({"error": "No operations provided"})
+
+    session = get_session()
+    try:
+        # Reserve tail priorities for every skip up front; this also takes
+        # the write lock, so the reads below are current
+        skips = sum(1 for item in operations if item["op"] == "skip")
+        next_priority = reserve_priorities(session, skips) if skips else None
+
+        found = {
+            f.id: f
+            for f in session.query(Feature).filter(Feature.id.in_({item["id"] for item in operations}))
+        }
+
+        results = []
+        for item in operations:
+            feature = found.get(item["id"])
+            op = item["op"]
+            result = {"id": item["id"], "op": op, "ok": False}
+            expected = item.get("expected_version")
+
+            if feature is None:
+                result["error"] = f"Feature with ID {item['id']} not found"
+            elif expected is not None and feature.version != expected:
+                result["error"] = f"Feature with ID {item['id']} was modified by another session (version {feature.version})"
+                result["conflict"] = True
+            elif op == "skip" and feature.passes:
+                result["error"] = "Cannot skip a feature that is already passing"
+            else:
+                if op == "mark_passing":
+                    feature.passes = True
+                elif op == "skip":
+                    feature.priority = next_priority
+                    result["priority"] = next_priority
+                    next_priority += 1
+                feature.in_progress = False
+                feature.lease_expires_at = None
+                result["ok"] = True
+            results.append(result)
+
+        failed = sum(1 for result in results if not result["ok"])
+        if atomic and failed:
+            session.rollback()
+            return to_json({"applied": 0, "failed": failed, "results": results})
+
+        session.commit()
+        return to_json({"applied": len(results) - failed, "failed": failed, "results": results})
+    except StaleDataError:
+        session.rollback()
+        return to_json({
+            "error": "Some features were modified by another session, nothing was applied; retry",
+            "conflict": True,
+        })
+    except Exception as e:
+        session.rollback()
+        return to_json({"error": str(e)})
     finally:
         session.close()
 
 
-@mcp.tool()
+def _find_dependency_cycle(count: int, edges: set) -> list[int]:
+    """Return the indexes on a dependency cycle, or [] if the graph is acyclic.
+
+    Kahn's algorithm over (dependent, dependency) index pairs; whatever
+    cannot be ordered is on, or downstream of, a cycle.
+    """
+    in_degree = [0] * count
+    dependents = {}
+    for feature, dependency in edges:
+        in_degree[feature] += 1
+        dependents.setdefault(dependency, []).append(feature)
+
+    ready = [i for i in range(count) if in_degree[i] == 0]
+    ordered = 0
+    while ready:
+        node = ready.pop()
+        ordered += 1
+        for feature in dependents.get(node, ()):
+            in_degree[feature] -= 1
+            if in_degree[feature] == 0:
+                ready.append(feature)
+
+    if ordered == count:
+        return []
+    return [i for i in range(count) if in_degree[i] > 0]
+
+
+@mcp.tool(structured_output=False)
+@db_tool(mutates=True)
 def feature_create_bulk(
-    features: Annotated[list[dict], Field(description="List of features to create, each with category, name, description, and steps")]
+    features: Annotated[list[dict], Field(description="List of features to create, each with category, name, description, steps, and optional depends_on (indexes in this list) / depends_on_ids (existing feature IDs)")]
 ) -> str:
     """Create multiple features in a single operation.
 
     Features are assigned sequential priorities based on their order.
-    All features start with passes=false.
+    All features start with passes=false. A feature with dependencies is
+    not served by feature_get_next / feature_claim_next until all of them
+    pass.
 
     This is typically used by the @scrum-master agent during /new-project
     Phase 2 to populate the feature database from the PRD breakdown.
@@ -357,91 +1201,244 @@ def feature_create_bulk(
             - name (str): Feature name
             - description (str): Detailed description
             - steps (list[str]): Implementation/test steps
+            - depends_on (list[int], optional): Indexes of features in this
+              list that must pass first
+            - depends_on_ids (list[int], optional): IDs of existing features
+              that must pass first
 
     Returns:
-        JSON with: created (int) - number of features created
+        JSON with: created (int) - number of features created, ids (list[int]),
+        dependencies (int) - number of dependency edges created
     """
+    # Validate everything before touching the database
+    required = ("category", "name", "description", "steps")
+    edges = set()
+    existing_ids = set()
+    for i, feature_data in enumerate(features):
+        if not isinstance(feature_data, dict) or not all(key in feature_data for key in required):
+            return to_json({
+                "error": f"Feature at index {i} missing required fields (category, name, description, steps)"
+            })
+        depends_on = feature_data.get("depends_on", [])
+        if not isinstance(depends_on, list) or not all(
+            isinstance(j, int) and 0 <= j < len(features) and j != i for j in depends_on
+        ):
+            return to_json({"error": f"Feature at index {i} has invalid depends_on (must list other indexes in this request)"})
+        depends_on_ids = feature_data.get("depends_on_ids", [])
+        if not isinstance(depends_on_ids, list) or not all(isinstance(fid, int) for fid in depends_on_ids):
+            return to_json({"error": f"Feature at index {i} has invalid depends_on_ids (must list feature IDs)"})
+        edges.update((i, j) for j in depends_on)
+        existing_ids.update(depends_on_ids)
+
+    cycle = _find_dependency_cycle(len(features), edges)
+    if cycle:
+        return to_json({"error": "Dependencies contain a cycle", "details": cycle})
+
     session = get_session()
     try:
-        # Get the starting priority
-        max_priority_result = session.query(Feature.priority).order_by(Feature.priority.desc()).first()
-        start_priority = (max_priority_result[0] + 1) if max_priority_result else 1
-
-        created_count = 0
-        for i, feature_data in enumerate(features):
-            # Validate required fields
-            if not all(key in feature_data for key in ["category", "name", "description", "steps"]):
-                return json.dumps({
-                    "error": f"Feature at index {i} missing required fields (category, name, description, steps)"
-                })
-
-            db_feature = Feature(
-                priority=start_priority + i,
-                category=feature_data["category"],
-                name=feature_data["name"],
-                description=feature_data["description"],
-                steps=feature_data["steps"],
-                passes=False,
-            )
-            session.add(db_feature)
-            created_count += 1
+        if existing_ids:
+            found = set(session.scalars(select(Feature.id).where(Feature.id.in_(existing_ids))))
+            missing = sorted(existing_ids - found)
+            if missing:
+                return to_json({"error": "Some depends_on_ids were not found", "details": missing})
+
+        # Reserve a contiguous block of tail priorities
+        start_priority = reserve_priorities(session, len(features))
+
+        # Set-based insert in chunks (executemany), no per-row ORM objects
+        stmt = insert(Feature).returning(Feature.id, sort_by_parameter_order=True)
+        created_ids = []
+        for chunk_start in range(0, len(features), BULK_INSERT_CHUNK_SIZE):
+            rows = [
+                {
+                    "priority": start_priority + i,
+                    "category": feature_data["category"],
+                    "name": feature_data["name"],
+                    "description": feature_data["description"],
+                    "steps": feature_data["steps"],
+                    "passes": False,
+                    "in_progress": False,
+                }
+                for i, feature_data in enumerate(
+                    features[chunk_start:chunk_start + BULK_INSERT_CHUNK_SIZE], start=chunk_start
+                )
+            ]
+            created_ids.extend(session.scalars(stmt, rows).all())
+
+        # Dependency edges; triggers count the unmet ones into blocked_by
+        dependency_rows = [
+            {"feature_id": created_ids[i], "depends_on_id": created_ids[j]} for i, j in edges
+        ] + [
+            {"feature_id": created_ids[i], "depends_on_id": fid}
+            for i, feature_data in enumerate(features)
+            for fid in set(feature_data.get("depends_on_ids", []))
+        ]
+        if dependency_rows:
+            session.execute(insert(FeatureDependency), dependency_rows)
 
         session.commit()
 
-        return json.dumps({"created": created_count}, indent=2)
+        return to_json({
+            "created": len(created_ids),
+            "ids": created_ids,
+            "dependencies": len(dependency_rows),
+        })
     except Exception as e:
         session.rollback()
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     finally:
         session.close()
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
+@db_tool
 def feature_get_by_category(
-    category: Annotated[str, Field(description="Category code (A-T) to filter by")]
+    category: Annotated[str, Field(description="Category code (A-T) to filter by")],
+    limit: Annotated[int, Field(default=100, ge=1, le=1000, description="Maximum number of features to return per page")] = 100,
+    after: Annotated[str | None, Field(default=None, description="Cursor from a previous page's next_cursor")] = None,
+    verbosity: Verbosity = "full"
 ) -> str:
-    """Get all features in a specific category.
+    """Get features in a specific category, one page at a time.
 
     Useful for understanding the scope of work in a particular area
     or for routing features to specialized agents.
 
+    Features are ordered by (priority, id). Pass the returned next_cursor
+    as after to fetch the following page; next_cursor is null on the last
+    page. The count, passing and pending totals always cover the whole
+    category.
+
     Args:
         category: Single letter category code (A-T)
+        limit: Maximum number of features per page (1-1000, default 100)
+        after: Cursor returned by the previous page
+        verbosity: Feature detail level (ids, summary, full; default full)
 
     Returns:
-        JSON with: features (list), count (int), passing (int), pending (int)
+        JSON with: features (list), returned (int), next_cursor (str|null),
+        count (int), passing (int), pending (int)
     """
+    category = category.upper()
+
+    query = (
+        select(Feature)
+        .where(Feature.category == category)
+        .order_by(Feature.priority.asc(), Feature.id.asc())
+        .limit(limit + 1)
+    )
+    if after is not None:
+        try:
+            after_priority, after_id = (int(part) for part in after.split(":"))
+        except ValueError:
+            return to_json({"error": f"Invalid cursor: {after}"})
+        query = query.where(tuple_(Feature.priority, Feature.id) > tuple_(after_priority, after_id))
+
     session = get_session()
     try:
-        features = (
-            session.query(Feature)
-            .filter(Feature.category == category.upper())
-            .order_by(Feature.priority.asc())
-            .all()
-        )
-
-        passing = sum(1 for f in features if f.passes)
-        pending = len(features) - passing
-
-        return json.dumps({
-            "category": category.upper(),
-            "features": [f.to_dict() for f in features],
-            "count": len(features),
+        count, passing = session.execute(
+            select(
+                func.count(),
+                func.coalesce(func.sum(case((Feature.passes == True, 1), else_=0)), 0),
+            ).where(Feature.category == category)
+        ).one()
+
+        features = session.scalars(query).all()
+        next_cursor = None
+        if len(features) > limit:
+            features = features[:limit]
+            next_cursor = f"{features[-1].priority}:{features[-1].id}"
+
+        return to_json({
+            "category": category,
+            "features": [f.to_dict(verbosity) for f in features],
+            "returned": len(features),
+            "next_cursor": next_cursor,
+            "count": count,
             "passing": passing,
-            "pending": pending
-        }, indent=2)
+            "pending": count - passing
+        })
     finally:
         session.close()
 
 
+@mcp.tool(structured_output=False)
+def feature_get_pool_metrics() -> str:
+    """Get database connection pool metrics for this server process.
+
+    Use this when profiling or diagnosing slow tool calls.
+
+    Returns:
+        JSON with: strategy, connects, checkouts, checkins, invalidations,
+        checked_out, peak_checked_out, overflow, peak_overflow, waits, max_wait_ms
+    """
+    metrics = get_pool_metrics(_engine) if _engine is not None else None
+    if metrics is None:
+        return to_json({"error": "Database not initialized"})
+    return to_json(metrics.to_dict())
+
+
 # ============================================================================
 # Dispatch Tools (added in v1.1)
 # ============================================================================
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
+async def feature_wait_for_changes(
+    since_seq: Annotated[int, Field(description="Return events after this sequence number (0 for the whole retained feed)", ge=0)] = 0,
+    timeout: Annotated[float, Field(description="Seconds to wait for a new event before returning an empty list", ge=0, le=300)] = 30,
+    group_id: Annotated[int | None, Field(default=None, description="Only return events for this parallel group", ge=1)] = None,
+    limit: Annotated[int, Field(description="Maximum events to return", ge=1, le=1000)] = 100
+) -> str:
+    """Wait for feature state changes (long-poll on the change feed).
+
+    Every change is recorded as an event with an increasing seq: created,
+    claimed, released, skipped, passing, reopened, ready (last dependency
+    passed), group_created, group_completed, group_aborted. Returns as soon
+    as there are events after since_seq, or an empty list after timeout.
+    Call again with the returned last_seq to follow the feed. Prefer this
+    over polling feature_get_parallel_status to learn when a group is done.
+
+    Args:
+        since_seq: Last sequence number already seen (0 to start)
+        timeout: Seconds to wait (0 returns immediately; max 300)
+        group_id: Optional parallel group filter
+        limit: Maximum events per call (default 100)
+
+    Returns:
+        JSON with: events (list), last_seq (int), truncated (bool - older
+        events after since_seq were pruned; re-read state before continuing)
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        # Take the wake-up event before reading so a write landing between
+        # the read and the wait is not missed
+        changed = _changed
+        try:
+            if _db_executor is None:
+                result = read_events(since_seq, group_id, limit)
+            else:
+                result = await loop.run_in_executor(_db_executor, read_events, since_seq, group_id, limit)
+        except Exception as e:
+            return to_json({"error": str(e)})
+
+        remaining = deadline - loop.time()
+        if result["events"] or result["truncated"] or remaining <= 0 or changed is None:
+            return to_json(result)
+
+        since_seq = result["last_seq"]
+        try:
+            await asyncio.wait_for(changed.wait(), min(remaining, EVENT_POLL_INTERVAL_SECONDS))
+        except asyncio.TimeoutError:
+            pass
+
+
+@mcp.tool(structured_output=False)
+@db_tool
 def feature_get_parallelizable(
-    limit: Annotated[int, Field(default=5, ge=1, le=10, description="Maximum number of parallelizable features to return")] = 5
+    limit: Annotated[int, Field(default=5, ge=1, le=10, description="Maximum number of parallelizable features to return")] = 5,
+    mode: Annotated[Literal["greedy", "max_parallel"], Field(default="greedy", description="greedy: first-fit in priority order; max_parallel: fill as many slots as possible")] = "greedy",
+    verbosity: Verbosity = "full"
 ) -> str:
     """Get pending features that can be safely parallelized.
 
@@ -453,8 +1450,17 @@ def feature_get_parallelizable(
 
     Use this at the start of /implement-features to identify parallel work.
 
+    In greedy mode, features are added in priority order whenever they are
+    compatible with everything selected so far. In max_parallel mode, the
+    batch with the most features is chosen (ties go to higher priority),
+    which fills agent slots a greedy pick would leave empty.
+
     Args:
         limit: Maximum number of features to return (1-10, default 5)
+        mode: Selection strategy, "greedy" (default) or "max_parallel"
+        verbosity: Detail level for primary and parallelizable features
+            (ids, summary, full; default full). Deferred features are
+            never returned in more than summary detail.
 
     Returns:
         JSON with:
@@ -463,18 +1469,20 @@ def feature_get_parallelizable(
         - deferred: List of features that cannot parallelize (with reason)
         - analysis: Summary of parallelization analysis
     """
+    deferred_verbosity = "ids" if verbosity == "ids" else "summary"
+
     session = get_session()
     try:
         # Get all pending features ordered by priority
         pending = (
             session.query(Feature)
-            .filter(Feature.passes == False, Feature.in_progress == False)
+            .filter(Feature.passes == False, Feature.blocked_by == 0, claimable(datetime.utcnow()))
             .order_by(Feature.priority.asc(), Feature.id.asc())
             .all()
         )
 
         if len(pending) == 0:
-            return json.dumps({
+            return to_json({
                 "error": "No pending features found",
                 "primary": None,
                 "parallelizable": [],
@@ -486,11 +1494,11 @@ def feature_get_parallelizable(
 
         # Check if primary is in a critical category
         if primary.category.upper() in CRITICAL_CATEGORIES:
-            return json.dumps({
-                "primary": primary.to_dict(),
+            return to_json({
+                "primary": primary.to_dict(verbosity),
                 "parallelizable": [],
                 "deferred": [
-                    {"feature": f.to_dict(), "reason": f"Primary feature is critical category ({primary.category})"}
+                    {"feature": f.to_dict(deferred_verbosity), "reason": f"Primary feature is critical category ({primary.category})"}
                     for f in pending[1:]
                 ],
                 "analysis": {
@@ -498,57 +1506,100 @@ def feature_get_parallelizable(
                     "is_critical": True,
                     "message": f"Category {primary.category} (Security/Payment) requires exclusive execution"
                 }
-            }, indent=2)
+            })
 
-        # Find features that can parallelize with primary
+        # Find features that can parallelize with primary. compatible holds
+        # the categories that can run alongside every selected feature.
+        primary_mask = category_mask(primary.category)
+        compatible = primary_mask
         parallelizable = []
         deferred = []
 
+        if mode == "max_parallel":
+            # Only the highest-priority feature of each category can be picked
+            candidates = {}
+            for feature in pending[1:]:
+                cat = feature.category.upper()
+                if cat not in candidates and primary_mask & category_bit(cat):
+                    candidates[cat] = feature
+            candidates = list(candidates.values())
+
+            selected = select_max_parallel(
+                [f.category for f in candidates],
+                primary_mask,
+                limit - 1,
+                PARALLEL_SELECTION_BUDGET_SECONDS,
+            )
+            parallelizable = [candidates[i] for i in selected]
+            for feature in parallelizable:
+                compatible &= category_mask(feature.category)
+
         for feature in pending[1:]:
+            if mode == "max_parallel":
+                if feature in parallelizable:
+                    continue
+                cat = feature.category.upper()
+                bit = category_bit(cat)
+                if cat in CRITICAL_CATEGORIES:
+                    reason = f"Critical category ({cat}) cannot parallelize"
+                elif not primary_mask & bit:
+                    reason = f"Category {cat} may conflict with primary category {primary.category}"
+                elif not compatible & bit:
+                    conflict = next(
+                        f for f in parallelizable if not category_mask(f.category) & bit
+                    )
+                    reason = f"Category {cat} may conflict with already selected category {conflict.category}"
+                else:
+                    reason = "Limit reached"
+                deferred.append({"feature": feature.to_dict(deferred_verbosity), "reason": reason})
+                continue
+
             if len(parallelizable) >= limit - 1:
                 deferred.append({
-                    "feature": feature.to_dict(),
+                    "feature": feature.to_dict(deferred_verbosity),
                     "reason": "Limit reached"
                 })
                 continue
 
             cat = feature.category.upper()
+            bit = category_bit(cat)
 
             # Critical categories never parallelize
             if cat in CRITICAL_CATEGORIES:
                 deferred.append({
-                    "feature": feature.to_dict(),
+                    "feature": feature.to_dict(deferred_verbosity),
                     "reason": f"Critical category ({cat}) cannot parallelize"
                 })
                 continue
 
             # Check if can parallelize with primary
-            if not can_parallelize_categories(primary.category, cat):
+            if not primary_mask & bit:
                 deferred.append({
-                    "feature": feature.to_dict(),
+                    "feature": feature.to_dict(deferred_verbosity),
                     "reason": f"Category {cat} may conflict with primary category {primary.category}"
                 })
                 continue
 
             # Check if can parallelize with already selected features
-            can_add = True
-            for selected in parallelizable:
-                if not can_parallelize_categories(selected.category, cat):
-                    can_add = False
-                    deferred.append({
-                        "feature": feature.to_dict(),
-                        "reason": f"Category {cat} may conflict with already selected category {selected.category}"
-                    })
-                    break
-
-            if can_add:
-                parallelizable.append(feature)
-
-        return json.dumps({
-            "primary": primary.to_dict(),
-            "parallelizable": [f.to_dict() for f in parallelizable],
+            if not compatible & bit:
+                conflict = next(
+                    f for f in parallelizable if not category_mask(f.category) & bit
+                )
+                deferred.append({
+                    "feature": feature.to_dict(deferred_verbosity),
+                    "reason": f"Category {cat} may conflict with already selected category {conflict.category}"
+                })
+                continue
+
+            parallelizable.append(feature)
+            compatible &= category_mask(cat)
+
+        return to_json({
+            "primary": primary.to_dict(verbosity),
+            "parallelizable": [f.to_dict(verbosity) for f in parallelizable],
             "deferred": deferred,
             "analysis": {
+                "mode": mode,
                 "primary_category": primary.category,
                 "is_critical": False,
                 "total_pending": len(pending),
@@ -556,12 +1607,13 @@ def feature_get_parallelizable(
                 "deferred_count": len(deferred),
                 "categories_selected": [primary.category] + [f.category for f in parallelizable]
             }
-        }, indent=2)
+        })
     finally:
         session.close()
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
+@db_tool(mutates=True)
 def feature_create_parallel_group(
     feature_ids: Annotated[list[int], Field(description="List of feature IDs to include in the parallel group")],
     session_id: Annotated[str, Field(description="Session ID of the parent session creating this group")]
@@ -586,26 +1638,35 @@ def feature_create_parallel_group(
     session = get_session()
     try:
         if not feature_ids:
-            return json.dumps({"error": "No feature IDs provided"})
-
-        # Verify all features exist and are pending
-        features = []
+            return to_json({"error": "No feature IDs provided"})
+
+        # Fetch all requested features in one query, then verify each is pending
+        requested_ids = list(dict.fromkeys(feature_ids))
+        found = {
+            f.id: f
+            for f in session.query(Feature).filter(Feature.id.in_(requested_ids)).all()
+        }
+
+        # Features with an expired lease may be taken over, unless an
+        # active group still holds them
+        now = datetime.utcnow()
+        active = set(session.scalars(active_group_ids()))
         errors = []
-        for fid in feature_ids:
-            feature = session.query(Feature).filter(Feature.id == fid).first()
+        for fid in requested_ids:
+            feature = found.get(fid)
             if feature is None:
                 errors.append(f"Feature {fid} not found")
             elif feature.passes:
                 errors.append(f"Feature {fid} is already passing")
-            elif feature.in_progress:
+            elif feature.blocked_by:
+                errors.append(f"Feature {fid} is waiting on {feature.blocked_by} unfinished dependencies")
+            elif feature.parallel_group_id in active:
+                errors.append(f"Feature {fid} is already in parallel group {feature.parallel_group_id}")
+            elif feature.in_progress and not feature.lease_expired(now):
                 errors.append(f"Feature {fid} is already in progress")
-            elif feature.parallel_group_id is not None:
-                errors.append(f"Feature {fid} is already in a parallel group")
-            else:
-                features.append(feature)
 
         if errors:
-            return json.dumps({"error": "Some features could not be assigned", "details": errors})
+            return to_json({"error": "Some features could not be assigned", "details": errors})
 
         # Create the parallel group
         group = ParallelGroup(
@@ -617,50 +1678,77 @@ def feature_create_parallel_group(
         session.add(group)
         session.flush()  # Get the group ID
 
-        # Assign features to the group
-        for feature in features:
-            feature.parallel_group_id = group.id
-            feature.dispatched_by = session_id
-            feature.dispatched_at = datetime.utcnow()
-            feature.in_progress = True
+        # Assign all features in a single UPDATE, guarded so that a feature
+        # claimed by another agent since the check above is not overwritten
+        assigned = (
+            session.query(Feature)
+            .filter(
+                Feature.id.in_(requested_ids),
+                Feature.passes == False,
+                Feature.blocked_by == 0,
+                claimable(now),
+            )
+            .update(
+                {
+                    Feature.parallel_group_id: group.id,
+                    Feature.dispatched_by: session_id,
+                    Feature.dispatched_at: now,
+                    Feature.in_progress: True,
+                    Feature.lease_expires_at: lease_until(None),
+                    Feature.version: Feature.version + 1,
+                },
+                synchronize_session=False,
+            )
+        )
+        if assigned != len(requested_ids):
+            session.rollback()
+            return to_json({
+                "error": "Some features were claimed by another session while creating the group, retry"
+            })
 
         session.commit()
 
-        # Refresh to get updated data
-        session.refresh(group)
-        for f in features:
-            session.refresh(f)
+        # Re-read the group and its features in one pass, in request order
+        order = {fid: i for i, fid in enumerate(requested_ids)}
+        features = sorted(group.features, key=lambda f: order[f.id])
 
-        return json.dumps({
+        return to_json({
             "group": group.to_dict(),
             "features": [f.to_dict() for f in features]
-        }, indent=2)
+        })
     except Exception as e:
         session.rollback()
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     finally:
         session.close()
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
+@db_tool(mutates=True)
 def feature_get_parallel_status(
-    group_id: Annotated[int, Field(description="ID of the parallel group to check", ge=1)]
+    group_id: Annotated[int, Field(description="ID of the parallel group to check", ge=1)],
+    verbosity: Verbosity = "full"
 ) -> str:
     """Get the status of a parallel execution group.
 
     Returns detailed status of all features in a parallel group,
-    including completion status and regression test status.
+    including completion status and regression test status. An active
+    group whose features all pass is marked completed, which emits a
+    group_completed change feed event.
 
     Use this to monitor progress of dispatched parallel work.
 
     Args:
         group_id: ID of the parallel group to check
+        verbosity: Feature detail level (ids, summary, full; default full)
 
     Returns:
         JSON with:
         - group: ParallelGroup dict
         - features: List of feature dicts with current status
-        - summary: Completion summary (total, passing, in_progress, pending)
+        - summary: Completion summary (total, passing, in_progress,
+          released, remaining); released features lost their lease and
+          wait for the parent session to claim them again
         - is_complete: True if all features are passing
     """
     session = get_session()
@@ -668,7 +1756,7 @@ def feature_get_parallel_status(
         group = session.query(ParallelGroup).filter(ParallelGroup.id == group_id).first()
 
         if group is None:
-            return json.dumps({"error": f"Parallel group {group_id} not found"})
+            return to_json({"error": f"Parallel group {group_id} not found"})
 
         features = (
             session.query(Feature)
@@ -688,22 +1776,24 @@ def feature_get_parallel_status(
             session.commit()
             session.refresh(group)
 
-        return json.dumps({
+        return to_json({
             "group": group.to_dict(),
-            "features": [f.to_dict() for f in features],
+            "features": [f.to_dict(verbosity) for f in features],
             "summary": {
                 "total": total,
                 "passing": passing,
                 "in_progress": in_progress,
+                "released": total - passing - in_progress,
                 "remaining": total - passing
             },
             "is_complete": is_complete
-        }, indent=2)
+        })
     finally:
         session.close()
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
+@db_tool(mutates=True)
 def feature_complete_parallel_group(
     group_id: Annotated[int, Field(description="ID of the parallel group to complete", ge=1)],
     regression_passed: Annotated[bool, Field(description="Whether regression tests passed")] = True
@@ -726,7 +1816,7 @@ def feature_complete_parallel_group(
         group = session.query(ParallelGroup).filter(ParallelGroup.id == group_id).first()
 
         if group is None:
-            return json.dumps({"error": f"Parallel group {group_id} not found"})
+            return to_json({"error": f"Parallel group {group_id} not found"})
 
         # Update status
         group.status = "completed"
@@ -734,15 +1824,16 @@ def feature_complete_parallel_group(
         session.commit()
         session.refresh(group)
 
-        return json.dumps({
+        return to_json({
             "group": group.to_dict(),
             "message": f"Parallel group {group_id} marked as completed"
-        }, indent=2)
+        })
     finally:
         session.close()
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
+@db_tool(mutates=True)
 def feature_abort_parallel_group(
     group_id: Annotated[int, Field(description="ID of the parallel group to abort", ge=1)]
 ) -> str:
@@ -764,10 +1855,10 @@ def feature_abort_parallel_group(
         group = session.query(ParallelGroup).filter(ParallelGroup.id == group_id).first()
 
         if group is None:
-            return json.dumps({"error": f"Parallel group {group_id} not found"})
+            return to_json({"error": f"Parallel group {group_id} not found"})
 
         if group.status != "active":
-            return json.dumps({"error": f"Parallel group {group_id} is not active (status: {group.status})"})
+            return to_json({"error": f"Parallel group {group_id} is not active (status: {group.status})"})
 
         # Get all features in the group
         features = (
@@ -781,6 +1872,7 @@ def feature_abort_parallel_group(
         for feature in features:
             if not feature.passes:
                 feature.in_progress = False
+                feature.lease_expires_at = None
                 feature.parallel_group_id = None
                 feature.dispatched_by = None
                 feature.dispatched_at = None
@@ -791,11 +1883,17 @@ def feature_abort_parallel_group(
         session.commit()
         session.refresh(group)
 
-        return json.dumps({
+        return to_json({
             "group": group.to_dict(),
             "released_features": released,
             "message": f"Parallel group {group_id} aborted, {len(released)} features released"
-        }, indent=2)
+        })
+    except StaleDataError:
+        session.rollback()
+        return to_json({
+            "error": f"Features in parallel group {group_id} were modified by another session, retry",
+            "conflict": True,
+        })
     finally:
         session.close()
 
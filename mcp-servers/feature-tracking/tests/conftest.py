@@ -0,0 +1,44 @@
+"""Shared fixtures for the feature tracking server tests."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# server.py and database.py are imported as top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import database  # noqa: E402
+import server  # noqa: E402
+
+CATEGORIES = "ABCDEFGHIJKLMNOPQRST"
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A fresh database with 400 features (150 passing) wired into server.
+
+    Tools are called through __wrapped__, so their bodies run inline
+    without the database executor.
+    """
+    engine, session_maker = database.create_database(tmp_path)
+    monkeypatch.setattr(server, "_engine", engine)
+    monkeypatch.setattr(server, "_session_maker", session_maker)
+
+    session = session_maker()
+    session.add_all(
+        database.Feature(
+            priority=i + 1,
+            category=CATEGORIES[i % len(CATEGORIES)],
+            name=f"Feature {i + 1}",
+            description="Test feature",
+            steps=[],
+            passes=i < 150,
+        )
+        for i in range(400)
+    )
+    session.commit()
+    session.close()
+
+    yield engine
+    engine.dispose()
@@ -0,0 +1,44 @@
+"""Import time budget for the server's own modules.
+
+Agents start a server per session, so import time is paid on every
+start. The dependencies (mcp, pydantic, SQLAlchemy) are preloaded, so the
+cumulative time -X importtime reports for server covers the server's
+own modules: database, the tool declarations and their pydantic models.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+
+# Keep in step with the budget in README.md (Startup)
+IMPORT_BUDGET_MS = 150
+PRELOAD = "import mcp.server.fastmcp, pydantic, sqlalchemy, sqlalchemy.orm"
+RUNS = 3
+
+
+def server_import_ms() -> float:
+    """Return the cumulative import time of server in one fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{PRELOAD}; import server"],
+        cwd=SERVER_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # import time: self [us] | cumulative | imported package
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == "server":
+            return int(fields[1]) / 1000
+    raise AssertionError(f"server missing from -X importtime output:\n{result.stderr[-2000:]}")
+
+
+def test_server_import_within_budget():
+    # Best of a few runs, so a busy machine does not fail the check
+    best = min(server_import_ms() for _ in range(RUNS))
+    assert best < IMPORT_BUDGET_MS, (
+        f"server imports in {best:.0f} ms, over the {IMPORT_BUDGET_MS} ms budget; "
+        "import modules only some code paths need inside those paths"
+    )
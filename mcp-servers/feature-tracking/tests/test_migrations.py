@@ -0,0 +1,101 @@
+"""Upgrades of unversioned (pre-v1.8) databases."""
+
+import sqlite3
+
+import pytest
+
+import database
+
+V1_0_FEATURES = """
+    CREATE TABLE features (
+        id INTEGER NOT NULL PRIMARY KEY,
+        priority INTEGER NOT NULL,
+        category VARCHAR(100) NOT NULL,
+        name VARCHAR(255) NOT NULL,
+        description TEXT NOT NULL,
+        steps JSON NOT NULL,
+        passes BOOLEAN
+    )
+"""
+
+
+def write_legacy(path, *statements):
+    """Create an unstamped features.db from raw DDL with two features."""
+    conn = sqlite3.connect(path / "features.db")
+    for statement in (V1_0_FEATURES, *statements):
+        conn.execute(statement)
+    conn.executemany(
+        "INSERT INTO features (priority, category, name, description, steps, passes) VALUES (?, ?, ?, ?, '[]', ?)",
+        [(1, "A", "first", "d", 1), (2, "B", "second", "d", 0)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def upgraded(path):
+    """Open the database through create_database; return (version, tables, stats)."""
+    engine, _ = database.create_database(path)
+    engine.dispose()
+    conn = sqlite3.connect(path / "features.db")
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        stats = conn.execute("SELECT total, passing, next_priority FROM feature_stats").fetchone()
+        return version, tables, stats
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize(
+    "statements",
+    [
+        pytest.param((), id="v1.0"),
+        pytest.param(("ALTER TABLE features ADD COLUMN in_progress BOOLEAN DEFAULT 0",), id="in_progress-only"),
+        pytest.param(
+            (
+                "ALTER TABLE features ADD COLUMN in_progress BOOLEAN DEFAULT 0",
+                "ALTER TABLE features ADD COLUMN parallel_group_id INTEGER",
+                "ALTER TABLE features ADD COLUMN dispatched_by VARCHAR(100)",
+                "ALTER TABLE features ADD COLUMN dispatched_at DATETIME",
+            ),
+            id="dispatch-columns-without-parallel_groups",
+        ),
+    ],
+)
+def test_partial_v1_files_upgrade(tmp_path, statements):
+    write_legacy(tmp_path, *statements)
+
+    version, tables, stats = upgraded(tmp_path)
+
+    assert version == database.SCHEMA_VERSION
+    assert {"parallel_groups", "feature_events", "import_checkpoints"} <= tables
+    assert stats == (2, 1, 3)
+
+
+def test_dry_run_reports_dated_version(tmp_path):
+    write_legacy(
+        tmp_path,
+        "ALTER TABLE features ADD COLUMN in_progress BOOLEAN DEFAULT 0",
+        "ALTER TABLE features ADD COLUMN parallel_group_id INTEGER",
+        "ALTER TABLE features ADD COLUMN dispatched_by VARCHAR(100)",
+        "ALTER TABLE features ADD COLUMN dispatched_at DATETIME",
+    )
+    engine = database._create_engine(database.get_database_url(tmp_path), "queue")
+    try:
+        pending = database.migrate_database(engine, dry_run=True)
+        assert database.get_schema_version(engine) == 1
+        assert [m["version"] for m in pending] == list(range(2, database.SCHEMA_VERSION + 1))
+    finally:
+        engine.dispose()
+
+
+def test_unstamped_current_file_is_stamped(tmp_path):
+    engine, _ = database.create_database(tmp_path)
+    engine.dispose()
+    conn = sqlite3.connect(tmp_path / "features.db")
+    conn.execute("PRAGMA user_version = 0")
+    conn.close()
+
+    version, _, _ = upgraded(tmp_path)
+
+    assert version == database.SCHEMA_VERSION
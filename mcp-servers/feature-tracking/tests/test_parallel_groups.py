@@ -0,0 +1,65 @@
+"""Parallel group membership across lease expiry."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import database
+import server
+
+
+def call(tool, **kwargs) -> dict:
+    return json.loads(getattr(server, tool).__wrapped__(**kwargs))
+
+
+def expire_lease(engine, feature_id):
+    with engine.begin() as conn:
+        conn.execute(
+            database.Feature.__table__.update()
+            .where(database.Feature.id == feature_id)
+            .values(lease_expires_at=datetime.utcnow() - timedelta(seconds=1))
+        )
+
+
+@pytest.fixture
+def group(db):
+    """Active group of the first two pending features, created by "parent"."""
+    ids = [151, 152]
+    group = call("feature_create_parallel_group", feature_ids=ids, session_id="parent")["group"]
+    return group["id"], ids
+
+
+def test_expired_member_stays_in_group(db, group):
+    group_id, (first, second) = group
+    expire_lease(db, second)
+
+    assert server.release_expired_leases() == [second]
+    call("feature_mark_passing", feature_id=first)
+    status = call("feature_get_parallel_status", group_id=group_id)
+
+    assert status["summary"] == {"total": 2, "passing": 1, "in_progress": 0, "released": 1, "remaining": 1}
+    assert not status["is_complete"]
+    assert status["group"]["status"] == "active"
+
+
+def test_expired_member_reserved_for_parent(db, group):
+    group_id, (_, second) = group
+    expire_lease(db, second)
+
+    assert call("feature_claim_next", session_id="other")["id"] != second
+    assert "error" in call("feature_create_parallel_group", feature_ids=[second], session_id="other")
+    assert "error" in call("feature_mark_in_progress", feature_id=second, session_id="other")
+
+    reclaimed = call("feature_mark_in_progress", feature_id=second, session_id="parent")
+    assert reclaimed["parallel_group_id"] == group_id
+    assert reclaimed["in_progress"]
+
+
+def test_abort_releases_expired_member(db, group):
+    group_id, (_, second) = group
+    expire_lease(db, second)
+    server.release_expired_leases()
+
+    assert second in call("feature_abort_parallel_group", group_id=group_id)["released_features"]
+    assert call("feature_mark_in_progress", feature_id=second, session_id="other")["parallel_group_id"] is None
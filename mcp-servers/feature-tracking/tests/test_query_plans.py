@@ -0,0 +1,59 @@
+"""Query plan checks for the hot feature-selection tools.
+
+Each tool runs against a real database while its SQL is captured, then
+every captured statement is re-planned with EXPLAIN QUERY PLAN. Picking
+the next feature must walk an index in (priority, id) order; a
+"USE TEMP B-TREE" step means SQLite sorts the whole pending set instead.
+"""
+
+import pytest
+from sqlalchemy import event
+
+import server
+
+
+def captured_plans(engine, call) -> dict:
+    """Run call() and return {statement: query plan details} for its SQL."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        return {
+            statement: [row[3] for row in cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+            for statement, parameters in statements
+        }
+    finally:
+        raw.close()
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        pytest.param(lambda: server.feature_get_next.__wrapped__(), id="feature_get_next"),
+        pytest.param(lambda: server.feature_claim_next.__wrapped__(session_id="test"), id="feature_claim_next"),
+        pytest.param(lambda: server.feature_get_parallelizable.__wrapped__(), id="feature_get_parallelizable"),
+        pytest.param(
+            lambda: server.feature_get_parallelizable.__wrapped__(mode="max_parallel"),
+            id="feature_get_parallelizable-max_parallel",
+        ),
+    ],
+)
+def test_no_temp_btree(db, call):
+    plans = captured_plans(db, call)
+
+    assert plans, "no SQL captured"
+    for statement, plan in plans.items():
+        assert not any("USE TEMP B-TREE" in step for step in plan), f"{plan}\n{statement}"
+    assert any(
+        "ix_features_ready_queue" in step for plan in plans.values() for step in plan
+    ), "pending features not read through ix_features_ready_queue"